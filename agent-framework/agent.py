@@ -2,12 +2,16 @@
 OpenAI Agent with Function Calling Capabilities
 """
 
-import json
+import asyncio
 import os
-from typing import Any, Dict, List, Optional, Callable
-from openai import OpenAI
+from typing import Any, AsyncIterator, Dict, List, Optional, Callable
+import orjson
+from openai import AsyncOpenAI, OpenAI
 from dotenv import load_dotenv
 
+# Bounded pool shared with the tool registry, so tool calls never start a thread each
+from tool_registry import _tool_executor
+
 # Load environment variables
 load_dotenv()
 
@@ -33,7 +37,14 @@ class OpenAIAgent:
         self.model = model
         self.system_prompt = system_prompt
         self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        # Used by achat() and achat_stream(), so many chats can share one event loop
+        self.async_client = AsyncOpenAI(api_key=self.client.api_key)
         self.functions = {}  # Registry of available functions
+        # Tool arguments for every completion call, rebuilt when a function is
+        # registered; empty until then so no tools are sent
+        self._tool_params: Dict[str, Any] = {}
+        # Reused across turns; rebuilt only if system_prompt is replaced
+        self._system_message = {"role": "system", "content": system_prompt}
         
     def register_function(self, name: str, func: Callable, description: str, parameters: Dict):
         """
@@ -56,6 +67,10 @@ class OpenAIAgent:
                 }
             }
         }
+        self._tool_params = {
+            "tools": [func_info["schema"] for func_info in self.functions.values()],
+            "tool_choice": "auto"
+        }
     
     def _execute_function(self, function_name: str, arguments: str) -> str:
         """
@@ -66,18 +81,51 @@ class OpenAIAgent:
             arguments: JSON string of arguments
             
         Returns:
-            String result of the function execution
+            String result of the function execution; dicts and lists are
+            returned as JSON so the model sees valid JSON, not a Python repr
         """
         if function_name not in self.functions:
             return f"Error: Function '{function_name}' not found"
         
         try:
-            args = json.loads(arguments)
+            args = orjson.loads(arguments)
             result = self.functions[function_name]["function"](**args)
+            if isinstance(result, (dict, list)):
+                return orjson.dumps(result, default=str).decode()
             return str(result)
         except Exception as e:
             return f"Error executing function '{function_name}': {str(e)}"
     
+    def _execute_functions(self, tool_calls: List[Any]) -> List[str]:
+        """
+        Execute one response's tool calls concurrently, returning results in call order.
+        
+        These are the agent's registered functions rather than the tool
+        registry's, so they don't go through tool_registry.execute_tools(),
+        but they run on its thread pool.
+        """
+        if len(tool_calls) == 1:
+            tool_call = tool_calls[0]
+            return [self._execute_function(tool_call.function.name, tool_call.function.arguments)]
+        
+        return list(_tool_executor.map(
+            self._execute_function,
+            [tool_call.function.name for tool_call in tool_calls],
+            [tool_call.function.arguments for tool_call in tool_calls]
+        ))
+    
+    def _build_messages(self, message: str, conversation_history: Optional[List[Dict]]) -> List[Dict]:
+        """Build the messages for one chat turn"""
+        if self._system_message["content"] is not self.system_prompt:
+            self._system_message = {"role": "system", "content": self.system_prompt}
+        messages = [self._system_message]
+        
+        if conversation_history:
+            messages.extend(conversation_history)
+        
+        messages.append({"role": "user", "content": message})
+        return messages
+    
     def chat(self, message: str, conversation_history: Optional[List[Dict]] = None) -> str:
         """
         Send a message to the agent and get a response.
@@ -89,23 +137,13 @@ class OpenAIAgent:
         Returns:
             The agent's response
         """
-        # Prepare messages
-        messages = [{"role": "system", "content": self.system_prompt}]
-        
-        if conversation_history:
-            messages.extend(conversation_history)
-        
-        messages.append({"role": "user", "content": message})
-        
-        # Prepare function schemas for the API call
-        tools = [func_info["schema"] for func_info in self.functions.values()] if self.functions else None
+        messages = self._build_messages(message, conversation_history)
         
         # Make the API call
         response = self.client.chat.completions.create(
             model=self.model,
             messages=messages,
-            tools=tools,
-            tool_choice="auto" if tools else None
+            **self._tool_params
         )
         
         assistant_message = response.choices[0].message
@@ -115,33 +153,149 @@ class OpenAIAgent:
             # Add the assistant's message to the conversation
             messages.append(assistant_message)
             
-            # Process each tool call
-            for tool_call in assistant_message.tool_calls:
-                function_name = tool_call.function.name
-                function_args = tool_call.function.arguments
-                
-                # Execute the function
-                function_result = self._execute_function(function_name, function_args)
-                
-                # Add the function result to the conversation
+            # Execute the tool calls concurrently; they don't depend on each other
+            results = self._execute_functions(assistant_message.tool_calls)
+            
+            # Add the function results to the conversation in call order
+            for tool_call, result in zip(assistant_message.tool_calls, results):
                 messages.append({
                     "tool_call_id": tool_call.id,
                     "role": "tool",
-                    "name": function_name,
-                    "content": function_result
+                    "name": tool_call.function.name,
+                    "content": result
                 })
             
             # Get the final response from the model
             final_response = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                tools=tools,
-                tool_choice="auto" if tools else None
+                **self._tool_params
             )
             
             return final_response.choices[0].message.content
         else:
             return assistant_message.content
+    
+    async def achat(self, message: str, conversation_history: Optional[List[Dict]] = None) -> str:
+        """
+        Async version of chat().
+        
+        Args:
+            message: The user message
+            conversation_history: Previous conversation messages
+        
+        Returns:
+            The agent's response
+        """
+        return "".join([text async for text in self.achat_stream(message, conversation_history)])
+    
+    async def achat_stream(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Send a message to the agent and stream the response as it is generated.
+        
+        If the model calls functions, they run concurrently in worker threads
+        and the final response is streamed once they finish.
+        
+        Args:
+            message: The user message
+            conversation_history: Previous conversation messages
+        
+        Yields:
+            Pieces of the agent's response text
+        """
+        messages = self._build_messages(message, conversation_history)
+        
+        tool_calls: List[Dict[str, str]] = []
+        content_parts: List[str] = []
+        async for text in self._astream_completion(messages, tool_calls):
+            content_parts.append(text)
+            yield text
+        
+        if not tool_calls:
+            return
+        
+        # Add the assistant's message to the conversation, with any text it
+        # streamed before the tool calls
+        messages.append({
+            "role": "assistant",
+            "content": "".join(content_parts) or None,
+            "tool_calls": [
+                {
+                    "id": tool_call["id"],
+                    "type": "function",
+                    "function": {"name": tool_call["name"], "arguments": tool_call["arguments"]}
+                }
+                for tool_call in tool_calls
+            ]
+        })
+        
+        # Execute the tool calls concurrently without blocking the event loop
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(
+                _tool_executor, self._execute_function, tool_call["name"], tool_call["arguments"]
+            )
+            for tool_call in tool_calls
+        ))
+        
+        # Add the function results to the conversation in call order
+        for tool_call, result in zip(tool_calls, results):
+            messages.append({
+                "tool_call_id": tool_call["id"],
+                "role": "tool",
+                "name": tool_call["name"],
+                "content": result
+            })
+        
+        # Stream the final response from the model; without tools it must answer
+        # in text, since tool calls from this round would go unexecuted
+        async for text in self._astream_completion(messages, [], use_tools=False):
+            yield text
+    
+    async def _astream_completion(
+        self,
+        messages: List[Dict],
+        tool_calls: List[Dict[str, str]],
+        use_tools: bool = True
+    ) -> AsyncIterator[str]:
+        """Stream one completion's text, collecting any tool calls into tool_calls"""
+        stream = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True,
+            **(self._tool_params if use_tools else {})
+        )
+        
+        # Tool call fragments arrive spread over many chunks, keyed by index
+        tool_call_parts: Dict[int, Dict[str, str]] = {}
+        
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            
+            delta = chunk.choices[0].delta
+            
+            if delta.content:
+                yield delta.content
+            
+            if delta.tool_calls:
+                for tool_call in delta.tool_calls:
+                    part = tool_call_parts.setdefault(
+                        tool_call.index, {"id": "", "name": "", "arguments": ""}
+                    )
+                    if tool_call.id:
+                        part["id"] = tool_call.id
+                    if tool_call.function:
+                        if tool_call.function.name:
+                            part["name"] += tool_call.function.name
+                        if tool_call.function.arguments:
+                            part["arguments"] += tool_call.function.arguments
+        
+        tool_calls.extend(tool_call_parts[index] for index in sorted(tool_call_parts))
 
 
 def main():
@@ -3,10 +3,54 @@ Abstract interface for AI models with support for various providers
 (OpenAI, Gemini, Claude, etc.)
 """
 
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import sys
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Callable, Union
-from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Callable, Tuple, Union
+from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
+
+import orjson
+
+from response_cache import ResponseCache
+
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Upper bound on tool calls executed concurrently for one response
+MAX_PARALLEL_TOOLS = 10
+
+# Default limit on concurrent requests made by chat_batch()
+BATCH_CONCURRENCY = 16
+
+# Default limit on model/tool round trips within one chat_simple() call
+MAX_TOOL_ITERATIONS = 6
+
+# Seconds to wait on provider HTTP requests (generation can be slow)
+HTTP_TIMEOUT = 120.0
 
 
 class MessageRole(Enum):
@@ -17,7 +61,11 @@ class MessageRole(Enum):
     TOOL = "tool"
 
 
-@dataclass
+# Role lookup for deserialization; a dict get is cheaper than MessageRole(value)
+_ROLE_BY_VALUE: Dict[str, MessageRole] = {role.value: role for role in MessageRole}
+
+
+@dataclass(slots=True, frozen=True)
 class Message:
     """Standardized message format"""
     role: MessageRole
@@ -25,9 +73,12 @@ class Message:
     tool_call_id: Optional[str] = None
     name: Optional[str] = None  # For tool messages
     tool_calls: Optional[List['ToolCall']] = None  # For assistant messages with tool calls
+    tool_call_ids: Optional[List[str]] = None  # For batched tool results
+    _serialized: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)  # Cached by messages_to_dict
+    _formatted: Optional[Dict[Callable, Any]] = field(default=None, repr=False, compare=False)  # Cached by format_message_cached
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolCall:
     """Represents a tool call made by the AI"""
     id: str
@@ -35,7 +86,7 @@ class ToolCall:
     arguments: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AIResponse:
     """Standardized response format from AI models"""
     content: Optional[str]
@@ -45,17 +96,20 @@ class AIResponse:
 
     def __post_init__(self):
         if self.tool_calls is None:
-            self.tool_calls = []
+            object.__setattr__(self, "tool_calls", [])
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolDefinition:
     """Standardized tool definition format"""
     name: str
     description: str
     function: Callable
     parameters: Dict[str, Any]  # JSON schema for parameters
-    
+    parallel_safe: bool = True  # False for stateful tools that must run one at a time
+    _validator: Any = field(default=None, repr=False, compare=False)  # Compiled from parameters
+    _schema_hash: Optional[str] = field(default=None, repr=False, compare=False)  # Set by add_tool
+
 
 class AIProvider(ABC):
     """
@@ -63,14 +117,129 @@ class AIProvider(ABC):
     
     This interface standardizes interaction with different AI models
     (OpenAI, Gemini, Claude, etc.) providing a unified API.
+    
+    Subclasses making HTTP requests should go through self.http_client so
+    every provider shares one pool of keep-alive connections.
     """
     
+    # HTTP client shared by all providers, created on first use
+    _shared_http_client = None
+    
+    # Async HTTP clients shared by all providers, one per event loop since
+    # pooled connections cannot move between loops
+    _shared_async_http_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    
     def __init__(self, model_name: str, api_key: Optional[str] = None):
         self.model_name = model_name
         self.api_key = api_key
         self.system_prompt: Optional[str] = None
         self.tools: Dict[str, ToolDefinition] = {}
+        self.response_cache: Optional[ResponseCache] = None
+        
+        # Provider-specific tool schema, rebuilt only when the toolset changes
+        self._tools_payload_cache: Optional[Any] = None
+        self._tools_version: int = 0
+        
+        # Learned tool call sequences: (previous tool or None at turn start, tool) -> count
+        self.tool_ngrams: Counter = Counter()
+        self.speculative_tools = False
+        self._speculation_executor: Optional[ThreadPoolExecutor] = None
+    
+    @property
+    def http_client(self) -> "httpx.Client":
+        """
+        HTTP client shared across all providers.
+        
+        Connections are kept alive between requests, so a chat() followed by
+        a tool follow-up skips the second TCP and TLS handshake. HTTP/2 is
+        used when the h2 package is installed.
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx library not installed. Run: pip install httpx")
+        
+        client = AIProvider._shared_http_client
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=HTTP_TIMEOUT,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+            )
+            AIProvider._shared_http_client = client
+        return client
+    
+    @property
+    def async_http_client(self) -> "httpx.AsyncClient":
+        """
+        Async HTTP client shared across all providers on the running event loop.
+        
+        Must be accessed from inside a coroutine.
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx library not installed. Run: pip install httpx")
+        
+        loop = asyncio.get_running_loop()
+        client = AIProvider._shared_async_http_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=200,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=60
+                )
+            )
+            AIProvider._shared_async_http_clients[loop] = client
+        return client
+    
+    async def startup(self):
+        """
+        Prepare pooled clients on the running event loop.
+        
+        Long-running servers call this once after creating a provider so the
+        first request does not pay for client setup. Providers with async SDK
+        clients override it to build them.
+        """
+        if HTTPX_AVAILABLE:
+            self.async_http_client
+    
+    async def aclose(self):
+        """Async version of close()"""
+        self.close()
+    
+    def close(self):
+        """
+        Release this provider's thread resources.
         
+        The shared HTTP clients stay open, since other providers and their
+        SDK clients hold them; close_shared_clients() closes them at shutdown.
+        """
+        if self._speculation_executor is not None:
+            self._speculation_executor.shutdown(wait=False)
+            self._speculation_executor = None
+    
+    @staticmethod
+    def close_shared_clients():
+        """Close the HTTP client shared by all providers; call once at process shutdown"""
+        client = AIProvider._shared_http_client
+        AIProvider._shared_http_client = None
+        if client is not None:
+            client.close()
+    
+    @staticmethod
+    async def aclose_shared_clients():
+        """Close the running event loop's async HTTP client and the shared sync client"""
+        client = AIProvider._shared_async_http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        AIProvider.close_shared_clients()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     @abstractmethod
     def chat(
         self, 
@@ -93,6 +262,96 @@ class AIProvider(ABC):
         """
         pass
     
+    def chat_stream(
+        self, 
+        messages: List[Message], 
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[AIResponse]:
+        """
+        Send messages to the AI and stream the response as it is generated.
+        
+        Content chunks carry only the newly generated text. Tool calls,
+        finish_reason and usage arrive on the final chunk. Providers without
+        native streaming yield the complete response as a single chunk.
+        
+        Args:
+            messages: List of messages in the conversation
+            temperature: Controls randomness (0.0 to 2.0)
+            max_tokens: Maximum tokens in response
+            **kwargs: Provider-specific parameters
+            
+        Yields:
+            AIResponse chunks
+        """
+        yield self.chat(messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
+    
+    async def achat(
+        self, 
+        messages: List[Message], 
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AIResponse:
+        """
+        Async version of chat().
+        
+        Providers with an async client should override this. The default
+        runs chat() in a worker thread so the event loop stays free.
+        """
+        return await asyncio.to_thread(
+            self.chat, messages, temperature=temperature, max_tokens=max_tokens, **kwargs
+        )
+    
+    async def achat_batch(
+        self,
+        messages_list: List[List[Message]],
+        concurrency: int = BATCH_CONCURRENCY,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> List[AIResponse]:
+        """
+        Send several independent conversations concurrently.
+        
+        Args:
+            messages_list: One list of messages per conversation
+            concurrency: Maximum requests in flight at once
+            temperature: Controls randomness (0.0 to 2.0)
+            max_tokens: Maximum tokens in each response
+            **kwargs: Provider-specific parameters
+            
+        Returns:
+            Responses in the same order as messages_list
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def limited_achat(messages: List[Message]) -> AIResponse:
+            async with semaphore:
+                return await self.achat(
+                    messages, temperature=temperature, max_tokens=max_tokens, **kwargs
+                )
+        
+        return list(await asyncio.gather(*(limited_achat(m) for m in messages_list)))
+    
+    def chat_batch(
+        self,
+        messages_list: List[List[Message]],
+        concurrency: int = BATCH_CONCURRENCY,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> List[AIResponse]:
+        """
+        Blocking version of achat_batch().
+        
+        Runs its own event loop, so call achat_batch() instead from async code.
+        """
+        return asyncio.run(self.achat_batch(
+            messages_list, concurrency, temperature=temperature, max_tokens=max_tokens, **kwargs
+        ))
+    
     @abstractmethod
     def supports_function_calling(self) -> bool:
         """Check if this provider supports function calling"""
@@ -103,22 +362,78 @@ class AIProvider(ABC):
         """Check if this provider supports system prompts"""
         pass
     
+    def supports_batched_tool_results(self) -> bool:
+        """
+        Whether several tool results can be sent back as one message.
+        
+        Providers that return True must translate TOOL messages carrying
+        tool_call_ids, whose content is a JSON list of results.
+        """
+        return False
+    
     def set_system_prompt(self, prompt: str):
         """Set the system prompt for the AI"""
+        if prompt != self.system_prompt:
+            # Call patterns are learned per system prompt
+            self.tool_ngrams.clear()
         self.system_prompt = prompt
     
+    def set_response_cache(self, cache: Optional[ResponseCache]):
+        """Set the cache used by chat_simple (None to disable caching)"""
+        self.response_cache = cache
+    
     def add_tool(self, tool: ToolDefinition):
         """Add a tool that the AI can use"""
-        self.tools[tool.name] = tool
+        _check_tool_signature(tool)
+        if FASTJSONSCHEMA_AVAILABLE and tool._validator is None and tool.parameters:
+            # Compile the schema once so each call only pays for validation
+            try:
+                object.__setattr__(tool, "_validator", fastjsonschema.compile(tool.parameters))
+            except fastjsonschema.JsonSchemaDefinitionException:
+                pass
+        if tool._schema_hash is None:
+            schema = orjson.dumps(tool.parameters, option=orjson.OPT_SORT_KEYS)
+            object.__setattr__(tool, "_schema_hash", hashlib.blake2b(schema, digest_size=16).hexdigest())
+        # Interned keys let lookups with interned call names match by identity
+        self.tools[sys.intern(tool.name)] = tool
+        self._invalidate_tools_payload()
     
     def remove_tool(self, tool_name: str):
         """Remove a tool"""
         if tool_name in self.tools:
             del self.tools[tool_name]
+            self._invalidate_tools_payload()
     
     def clear_tools(self):
         """Remove all tools"""
         self.tools.clear()
+        self._invalidate_tools_payload()
+    
+    def _invalidate_tools_payload(self):
+        """Mark the serialized toolset stale after a tool change"""
+        self._tools_version += 1
+        self._tools_payload_cache = None
+    
+    def _get_tools_payload(self) -> Any:
+        """Tools in the provider's wire format, serialized once per toolset"""
+        if self._tools_payload_cache is None:
+            self._tools_payload_cache = self._serialize_tools()
+        return self._tools_payload_cache
+    
+    def _serialize_tools(self) -> Any:
+        """
+        Convert the registered tools to the provider's function-calling format.
+        
+        Providers override this; the result is cached by _get_tools_payload().
+        """
+        return [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.parameters
+            }
+            for tool in self.tools.values()
+        ]
     
     def get_tools(self) -> List[ToolDefinition]:
         """Get all registered tools"""
@@ -134,16 +449,236 @@ class AIProvider(ABC):
         Returns:
             String result of the tool execution
         """
-        if tool_call.name not in self.tools:
-            return f"Error: Tool '{tool_call.name}' not found"
-        
-        tool = self.tools[tool_call.name]
+        tool, error = self._resolve_tool(tool_call)
+        if error is not None:
+            return error
         
+        # Signatures are checked in add_tool(), so the call itself is the
+        # only remaining runtime check
         try:
             result = tool.function(**tool_call.arguments)
-            return str(result)
         except Exception as e:
-            return f"Error executing tool '{tool_call.name}': {str(e)}"
+            return f"Error executing tool '{tool_call.name}': {e!r}"
+        return result if type(result) is str else str(result)
+    
+    async def aexecute_tool(self, tool_call: ToolCall) -> str:
+        """
+        Async version of execute_tool().
+        
+        Coroutine tools are awaited directly; plain functions run in a
+        worker thread.
+        """
+        tool, error = self._resolve_tool(tool_call)
+        if error is not None:
+            return error
+        
+        if not inspect.iscoroutinefunction(tool.function):
+            return await asyncio.to_thread(self.execute_tool, tool_call)
+        
+        try:
+            result = await tool.function(**tool_call.arguments)
+        except Exception as e:
+            return f"Error executing tool '{tool_call.name}': {e!r}"
+        return result if type(result) is str else str(result)
+    
+    def _resolve_tool(self, tool_call: ToolCall) -> Tuple[Optional[ToolDefinition], Optional[str]]:
+        """Look up and validate a tool call, returning (tool, error message)"""
+        tool = self.tools.get(sys.intern(tool_call.name))
+        if tool is None:
+            return None, f"Error: Tool '{tool_call.name}' not found"
+        
+        if tool._validator is not None:
+            try:
+                tool._validator(tool_call.arguments)
+            except fastjsonschema.JsonSchemaValueException as e:
+                return None, f"Error: Invalid arguments for tool '{tool_call.name}': {e.message}"
+        
+        return tool, None
+    
+    def execute_tools(
+        self,
+        tool_calls: List[ToolCall],
+        known_results: Optional[Dict[int, str]] = None
+    ) -> List[str]:
+        """
+        Execute several tool calls, running parallel-safe tools concurrently.
+        
+        Args:
+            tool_calls: The tool calls to execute
+            known_results: Results already available, by index into tool_calls
+            
+        Returns:
+            String results in the same order as tool_calls
+        """
+        known_results = known_results or {}
+        results: List[Optional[str]] = [known_results.get(i) for i in range(len(tool_calls))]
+        
+        parallel = [
+            i for i, tool_call in enumerate(tool_calls)
+            if i not in known_results
+            and getattr(self.tools.get(tool_call.name), "parallel_safe", True)
+        ]
+        if len(parallel) < 2:
+            return [
+                result if i in known_results else self.execute_tool(tool_call)
+                for i, (tool_call, result) in enumerate(zip(tool_calls, results))
+            ]
+        
+        with ThreadPoolExecutor(max_workers=min(len(parallel), MAX_PARALLEL_TOOLS)) as executor:
+            futures = {i: executor.submit(self.execute_tool, tool_calls[i]) for i in parallel}
+            
+            # Stateful tools run one at a time, in order, while the pool works
+            for i, tool_call in enumerate(tool_calls):
+                if i not in futures and i not in known_results:
+                    results[i] = self.execute_tool(tool_call)
+            
+            for i, future in futures.items():
+                results[i] = future.result()
+        
+        return results
+    
+    async def aexecute_tools(self, tool_calls: List[ToolCall]) -> List[str]:
+        """
+        Async version of execute_tools().
+        
+        Parallel-safe tools run concurrently; the rest run one at a time,
+        in order, alongside them.
+        
+        Args:
+            tool_calls: The tool calls to execute
+            
+        Returns:
+            String results in the same order as tool_calls
+        """
+        parallel = [
+            i for i, tool_call in enumerate(tool_calls)
+            if getattr(self.tools.get(tool_call.name), "parallel_safe", True)
+        ]
+        parallel_set = set(parallel)
+        serial = [i for i in range(len(tool_calls)) if i not in parallel_set]
+        
+        async def run_serial() -> List[str]:
+            return [await self.aexecute_tool(tool_calls[i]) for i in serial]
+        
+        *parallel_results, serial_results = await asyncio.gather(
+            *(self.aexecute_tool(tool_calls[i]) for i in parallel),
+            run_serial()
+        )
+        
+        results: List[Optional[str]] = [None] * len(tool_calls)
+        for i, result in zip(parallel + serial, parallel_results + serial_results):
+            results[i] = result
+        return results
+    
+    def _tool_result_messages(
+        self,
+        tool_calls: List[ToolCall],
+        tool_results: List[str]
+    ) -> List[Message]:
+        """
+        Build the TOOL messages reporting results back to the model.
+        
+        When the provider supports it, several results are batched into one
+        message to save the per-message framing in the follow-up prompt.
+        """
+        if len(tool_calls) > 1 and self.supports_batched_tool_results():
+            batch = [
+                {"tool_call_id": tc.id, "name": tc.name, "output": result}
+                for tc, result in zip(tool_calls, tool_results)
+            ]
+            return [Message(
+                role=MessageRole.TOOL,
+                content=orjson.dumps(batch).decode(),
+                tool_call_ids=[tc.id for tc in tool_calls]
+            )]
+        
+        return [
+            Message(
+                role=MessageRole.TOOL,
+                content=tool_result,
+                tool_call_id=tool_call.id,
+                name=tool_call.name
+            )
+            for tool_call, tool_result in zip(tool_calls, tool_results)
+        ]
+    
+    def predict_next_tool(self, previous_tool: Optional[str] = None) -> Optional[str]:
+        """Most frequently observed tool to follow previous_tool (None for turn start)"""
+        best_tool = None
+        best_count = 0
+        for (prev, tool), count in self.tool_ngrams.items():
+            if prev == previous_tool and count > best_count and tool in self.tools:
+                best_tool, best_count = tool, count
+        return best_tool
+    
+    def _record_tool_sequence(self, tool_calls: List[ToolCall], previous_tool: Optional[str] = None):
+        """Learn which tools follow each other within a turn"""
+        for tool_call in tool_calls:
+            self.tool_ngrams[(previous_tool, tool_call.name)] += 1
+            previous_tool = tool_call.name
+    
+    def _start_speculation(self, previous_tool: Optional[str] = None) -> Optional[Tuple[str, Future]]:
+        """
+        Pre-execute the predicted next tool while the model is generating.
+        
+        Only parallel-safe tools without required parameters are run, since
+        those are the only calls whose arguments can be known in advance.
+        """
+        if not self.speculative_tools:
+            return None
+        
+        tool_name = self.predict_next_tool(previous_tool)
+        if tool_name is None:
+            return None
+        
+        tool = self.tools[tool_name]
+        if not tool.parallel_safe or tool.parameters.get("required"):
+            return None
+        
+        if self._speculation_executor is None:
+            self._speculation_executor = ThreadPoolExecutor(max_workers=1)
+        
+        speculative_call = ToolCall(id="speculative", name=tool_name, arguments={})
+        return tool_name, self._speculation_executor.submit(self.execute_tool, speculative_call)
+    
+    def _commit_speculation(
+        self,
+        speculation: Optional[Tuple[str, Future]],
+        tool_calls: List[ToolCall]
+    ) -> Dict[int, str]:
+        """Reuse a speculative result if the model made the same call, else discard it"""
+        if speculation is None:
+            return {}
+        
+        tool_name, future = speculation
+        for i, tool_call in enumerate(tool_calls):
+            if tool_call.name == tool_name and not tool_call.arguments:
+                return {i: future.result()}
+        return {}
+    
+    def _format_message(self, msg: Message) -> Dict[str, Any]:
+        """
+        Convert one message to the provider's wire format.
+        
+        Providers override this to emit their native schema directly rather
+        than re-mapping the generic dict. The default is the generic form.
+        Results are cached per provider class, so the output must depend only
+        on the message.
+        """
+        return msg._serialized or _message_to_dict(msg)
+    
+    def _format_messages(self, messages: List[Message]) -> List[Dict[str, Any]]:
+        """
+        Convert messages to the provider's wire format in one pass.
+        
+        Each message is formatted once per provider class and reused whenever
+        the conversation is resent, so a turn only formats its new messages.
+        """
+        format_message = self._format_message
+        # Keyed by the class's function so the cache survives provider switches
+        # and messages never hold a reference to the provider instance
+        key = type(self)._format_message
+        return [format_message_cached(msg, format_message, key) for msg in messages]
     
     def create_message(self, role: MessageRole, content: str, **kwargs) -> Message:
         """Helper to create a standardized message"""
@@ -153,6 +688,9 @@ class AIProvider(ABC):
         self, 
         message: str, 
         conversation_history: Optional[List[Message]] = None,
+        use_cache: bool = False,
+        stream_callback: Optional[Callable[[str], None]] = None,
+        max_iterations: int = MAX_TOOL_ITERATIONS,
         **kwargs
     ) -> str:
         """
@@ -161,11 +699,103 @@ class AIProvider(ABC):
         Args:
             message: User message
             conversation_history: Previous messages
+            use_cache: Cache this response even when temperature is non-zero
+            stream_callback: Called with each piece of response text as it arrives
+            max_iterations: Maximum rounds of tool execution before answering
             **kwargs: Additional parameters for chat()
             
         Returns:
             AI response content as string
         """
+        messages = self._build_simple_messages(message, conversation_history)
+        
+        cached, cache_entry = self._check_response_cache(
+            message, messages, conversation_history, use_cache, kwargs
+        )
+        if cached is not None:
+            if stream_callback is not None:
+                stream_callback(cached)
+            return cached
+        
+        if not self.tools:
+            # Fast path: with no tools registered there is nothing to
+            # speculate on or execute
+            response = self._complete(messages, stream_callback, **kwargs)
+            tool_calls = []
+        else:
+            response, tool_calls = self._chat_with_tools(
+                messages, stream_callback, max_iterations, **kwargs
+            )
+        
+        return self._finish_simple(message, response, tool_calls, cache_entry)
+    
+    async def achat_simple(
+        self, 
+        message: str, 
+        conversation_history: Optional[List[Message]] = None,
+        use_cache: bool = False,
+        max_iterations: int = MAX_TOOL_ITERATIONS,
+        **kwargs
+    ) -> str:
+        """
+        Async version of chat_simple().
+        
+        Lets callers run many conversations on one event loop. Tool calls
+        from a single response are executed concurrently.
+        
+        Args:
+            message: User message
+            conversation_history: Previous messages
+            use_cache: Cache this response even when temperature is non-zero
+            max_iterations: Maximum rounds of tool execution before answering
+            **kwargs: Additional parameters for achat()
+            
+        Returns:
+            AI response content as string
+        """
+        messages = self._build_simple_messages(message, conversation_history)
+        
+        cached, cache_entry = self._check_response_cache(
+            message, messages, conversation_history, use_cache, kwargs
+        )
+        if cached is not None:
+            return cached
+        
+        response = await self.achat(messages, **kwargs)
+        executed: List[ToolCall] = []
+        previous_tool = None
+        
+        # Keep executing tools until the model answers without calling any
+        for _ in range(max_iterations if self.tools else 0):
+            tool_calls = response.tool_calls
+            if not tool_calls:
+                break
+            
+            # Add the assistant's response with tool calls
+            messages.append(Message(
+                role=MessageRole.ASSISTANT,
+                content=response.content or "",
+                tool_calls=tool_calls
+            ))
+            
+            # Execute tools and add results
+            tool_results = await self.aexecute_tools(tool_calls)
+            self._record_tool_sequence(tool_calls, previous_tool)
+            messages.extend(self._tool_result_messages(tool_calls, tool_results))
+            executed.extend(tool_calls)
+            previous_tool = tool_calls[-1].name
+            
+            # Get the next response after tool execution
+            response = await self.achat(messages, **kwargs)
+        
+        return self._finish_simple(message, response, executed, cache_entry)
+    
+    def _build_simple_messages(
+        self,
+        message: str,
+        conversation_history: Optional[List[Message]]
+    ) -> List[Message]:
+        """Build the message list for a chat_simple() call"""
         messages = []
         
         # Add system prompt if supported and set
@@ -178,45 +808,242 @@ class AIProvider(ABC):
         
         # Add current message
         messages.append(self.create_message(MessageRole.USER, message))
+        return messages
+    
+    def _check_response_cache(
+        self,
+        message: str,
+        messages: List[Message],
+        conversation_history: Optional[List[Message]],
+        use_cache: bool,
+        chat_kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[Tuple[str, str, Optional[str]]]]:
+        """
+        Check the response cache before calling the model.
+        
+        Only deterministic requests are cached unless the caller opts in.
+        
+        Returns:
+            Tuple of (cached content or None, (key, namespace, context hash)
+            to store the response under, or None if it shouldn't be cached).
+            The context hash is None for standalone queries, which are only
+            matched exactly.
+        """
+        cache = self.response_cache
+        if cache is None or not (use_cache or chat_kwargs.get("temperature", 0.7) == 0):
+            return None, None
+        
+        cache_key = self._response_cache_key(messages, chat_kwargs)
+        namespace = self._response_cache_namespace(chat_kwargs)
+        context_hash = self._response_cache_context(cache, conversation_history)
+        cached = cache.get(cache_key)
+        if cached is None and context_hash is not None:
+            cached = cache.get_similar(message, namespace, context_hash)
+        if cached is not None:
+            return cached["content"], None
+        return None, (cache_key, namespace, context_hash)
+    
+    def _finish_simple(
+        self,
+        message: str,
+        response: AIResponse,
+        tool_calls: List[ToolCall],
+        cache_entry: Optional[Tuple[str, str, Optional[str]]]
+    ) -> str:
+        """Turn the final response into a string, caching it if requested"""
+        # Ensure we return a string
+        content = response.content
+        if content is None:
+            return "No response generated"
+        elif not isinstance(content, str):
+            content = str(content)
+        
+        if cache_entry is not None:
+            cache_key, namespace, context_hash = cache_entry
+            self.response_cache.set(
+                cache_key,
+                {
+                    "content": content,
+                    "tool_calls": [
+                        {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
+                        for tc in tool_calls
+                    ]
+                },
+                # Standalone queries skip the embedding call entirely
+                text=message if context_hash is not None else None,
+                namespace=namespace,
+                context_hash=context_hash or ""
+            )
+        
+        return content
+    
+    def _chat_with_tools(
+        self,
+        messages: List[Message],
+        stream_callback: Optional[Callable[[str], None]] = None,
+        max_iterations: int = MAX_TOOL_ITERATIONS,
+        **kwargs
+    ) -> Tuple[AIResponse, List[ToolCall]]:
+        """
+        Get a response, executing tool calls until the model stops making them.
+        
+        Args:
+            messages: Conversation so far; tool round messages are appended to it
+            stream_callback: Called with each piece of response text as it arrives
+            max_iterations: Maximum rounds of tool execution
+            **kwargs: Additional parameters for chat()
+            
+        Returns:
+            Tuple of (final response, tool calls that were executed)
+        """
+        executed: List[ToolCall] = []
+        previous_tool = None
         
-        # Get response
-        response = self.chat(messages, **kwargs)
+        # Get response, pre-executing the likely first tool in the meantime
+        speculation = self._start_speculation()
+        response = self._complete(messages, stream_callback, **kwargs)
         
-        # Handle tool calls if present
-        if response.tool_calls:
+        # Keep executing tools until the model answers without calling any
+        for _ in range(max_iterations):
+            tool_calls = response.tool_calls
+            if not tool_calls:
+                break
+            
             # Add the assistant's response with tool calls
             messages.append(Message(
                 role=MessageRole.ASSISTANT,
                 content=response.content or "",
-                tool_calls=response.tool_calls
+                tool_calls=tool_calls
             ))
             
             # Execute tools and add results
-            for tool_call in response.tool_calls:
-                tool_result = self.execute_tool(tool_call)
-                messages.append(Message(
-                    role=MessageRole.TOOL,
-                    content=tool_result,
-                    tool_call_id=tool_call.id,
-                    name=tool_call.name
-                ))
+            tool_results = self.execute_tools(
+                tool_calls,
+                self._commit_speculation(speculation, tool_calls)
+            )
+            self._record_tool_sequence(tool_calls, previous_tool)
+            messages.extend(self._tool_result_messages(tool_calls, tool_results))
+            executed.extend(tool_calls)
+            previous_tool = tool_calls[-1].name
             
-            # Get final response after tool execution
-            final_response = self.chat(messages, **kwargs)
-            content = final_response.content
-            if content is None:
-                return "No response generated"
-            elif not isinstance(content, str):
-                return str(content)
-            return content
+            # Get the next response after tool execution
+            speculation = self._start_speculation(previous_tool)
+            response = self._complete(messages, stream_callback, **kwargs)
         
-        # Ensure we return a string
-        content = response.content
-        if content is None:
-            return "No response generated"
-        elif not isinstance(content, str):
-            return str(content)
-        return content
+        return response, executed
+    
+    def _complete(
+        self,
+        messages: List[Message],
+        stream_callback: Optional[Callable[[str], None]] = None,
+        **kwargs
+    ) -> AIResponse:
+        """Get a full response, streaming its text to stream_callback when provided"""
+        if stream_callback is None:
+            return self.chat(messages, **kwargs)
+        
+        content_parts = []
+        tool_calls = []
+        finish_reason = None
+        usage = None
+        for chunk in self.chat_stream(messages, **kwargs):
+            if chunk.content:
+                content_parts.append(chunk.content)
+                stream_callback(chunk.content)
+            tool_calls.extend(chunk.tool_calls)
+            finish_reason = chunk.finish_reason or finish_reason
+            usage = chunk.usage or usage
+        
+        return AIResponse(
+            content="".join(content_parts) if content_parts else None,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason,
+            usage=usage
+        )
+    
+    def _response_cache_key(self, messages: List[Message], chat_kwargs: Dict[str, Any]) -> str:
+        """Exact-match cache key for a request and its generation parameters"""
+        return ResponseCache.make_key({
+            "model": self.model_name,
+            "messages": messages_to_dict(messages),
+            "tools": self._tools_fingerprint(),
+            "params": sorted(chat_kwargs.items())
+        })
+    
+    def _tools_fingerprint(self) -> List[Tuple[str, str]]:
+        """Sorted (name, schema hash) pairs identifying the current toolset"""
+        return sorted((name, tool._schema_hash) for name, tool in self.tools.items())
+    
+    def _chat_cache_key(self, request: Dict[str, Any], temperature: float) -> Optional[str]:
+        """
+        Cache key for a single chat() request, or None if it shouldn't be cached.
+        
+        Providers call this with their converted request so repeated
+        deterministic requests (retries, tool rounds, dev reruns) skip the API.
+        """
+        if self.response_cache is None or temperature != 0:
+            return None
+        return ResponseCache.make_key({
+            "model": self.model_name,
+            "tools": self._tools_fingerprint(),
+            "request": request
+        })
+    
+    def _get_cached_chat_response(self, cache_key: Optional[str]) -> Optional[AIResponse]:
+        """Look up a response stored by _cache_chat_response()"""
+        if cache_key is None:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is None:
+            return None
+        return AIResponse(
+            content=cached["content"],
+            tool_calls=[ToolCall(**tc) for tc in cached["tool_calls"]],
+            finish_reason=cached["finish_reason"],
+            usage=cached["usage"]
+        )
+    
+    def _cache_chat_response(self, cache_key: Optional[str], response: AIResponse):
+        """Store a chat() response under a key from _chat_cache_key()"""
+        if cache_key is None:
+            return
+        self.response_cache.set(cache_key, {
+            "content": response.content,
+            "tool_calls": [
+                {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
+                for tc in response.tool_calls
+            ],
+            "finish_reason": response.finish_reason,
+            "usage": response.usage
+        })
+    
+    def _response_cache_context(
+        self,
+        cache: ResponseCache,
+        conversation_history: Optional[List[Message]]
+    ) -> Optional[str]:
+        """
+        Hash of the recent history that a semantic cache hit must match.
+        
+        Returns None without any history, since standalone queries skip
+        semantic lookup and only use exact matches.
+        """
+        if not conversation_history:
+            return None
+        if cache.context_messages <= 0:
+            return ""
+        # islice rather than slicing, so a deque history works too
+        start = max(len(conversation_history) - cache.context_messages, 0)
+        recent = list(islice(conversation_history, start, None))
+        return ResponseCache.make_key({"context": messages_to_dict(recent)})
+    
+    def _response_cache_namespace(self, chat_kwargs: Dict[str, Any]) -> str:
+        """Semantic cache partition so hits never cross models, toolsets or generation parameters"""
+        return ResponseCache.make_key({
+            "model": self.model_name,
+            "tools": self._tools_fingerprint(),
+            "params": sorted(chat_kwargs.items())
+        })
 
 
 class ProviderFactory:
@@ -224,11 +1051,24 @@ class ProviderFactory:
     
     _providers = {}
     
+    # Modules that register the built-in providers, imported on first use so
+    # their SDKs are only loaded for the provider actually selected
+    _provider_modules = {
+        "openai": "openai_provider",
+        "gemini": "gemini_provider",
+    }
+    
     @classmethod
     def register_provider(cls, name: str, provider_class: type):
         """Register a new provider"""
         cls._providers[name] = provider_class
     
+    @classmethod
+    def _load_provider(cls, name: str):
+        """Import the module that registers a built-in provider, if not done yet"""
+        if name not in cls._providers and name in cls._provider_modules:
+            importlib.import_module(cls._provider_modules[name])
+    
     @classmethod
     def create_provider(
         cls, 
@@ -237,7 +1077,16 @@ class ProviderFactory:
         api_key: Optional[str] = None,
         **kwargs
     ) -> AIProvider:
-        """Create a provider instance"""
+        """
+        Create a provider instance.
+        
+        Args:
+            provider_name: Registered provider name (e.g., "openai")
+            model_name: Name of the model to use
+            api_key: API key for the provider
+            **kwargs: Additional provider-specific arguments
+        """
+        cls._load_provider(provider_name)
         if provider_name not in cls._providers:
             raise ValueError(f"Unknown provider: {provider_name}")
         
@@ -247,57 +1096,169 @@ class ProviderFactory:
     @classmethod
     def list_providers(cls) -> List[str]:
         """List all registered providers"""
+        for name in cls._provider_modules:
+            try:
+                cls._load_provider(name)
+            except ImportError:
+                # Provider SDK isn't installed
+                pass
         return list(cls._providers.keys())
 
 
+def _check_tool_signature(tool: ToolDefinition):
+    """
+    Check that a tool's function accepts the arguments its schema describes.
+    
+    Raises:
+        ValueError: If a required function parameter is missing from the
+            schema, or a schema property has no matching parameter
+    """
+    try:
+        signature = inspect.signature(tool.function)
+    except (TypeError, ValueError):
+        # Builtins and some callables don't expose a signature
+        return
+    
+    params = signature.parameters.values()
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params):
+        return
+    
+    properties = set((tool.parameters or {}).get("properties", {}))
+    accepted = {
+        p.name for p in params
+        if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    }
+    missing = [
+        p.name for p in params
+        if p.default is inspect.Parameter.empty
+        and p.kind is not inspect.Parameter.VAR_POSITIONAL
+        and p.name not in properties
+    ]
+    if missing:
+        raise ValueError(f"Tool '{tool.name}' requires parameters not in its schema: {missing}")
+    unknown = sorted(properties - accepted)
+    if unknown:
+        raise ValueError(f"Tool '{tool.name}' schema has parameters the function doesn't accept: {unknown}")
+
+
 # Utility functions for common operations
 
 def create_tool_from_function(
     func: Callable,
     name: str,
     description: str,
-    parameters: Dict[str, Any]
+    parameters: Dict[str, Any],
+    parallel_safe: bool = True
 ) -> ToolDefinition:
     """Helper to create a ToolDefinition from a function"""
     return ToolDefinition(
         name=name,
         description=description,
         function=func,
-        parameters=parameters
+        parameters=parameters,
+        parallel_safe=parallel_safe
     )
 
+_USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+def aggregate_usage(responses: List[AIResponse]) -> Dict[str, int]:
+    """
+    Sum token usage over many responses, e.g. the results of chat_batch().
+    
+    Responses without usage count as zero. With numpy installed the counts
+    are gathered into one int64 array and summed in a single call.
+    """
+    if NUMPY_AVAILABLE:
+        usages = np.zeros((len(responses), len(_USAGE_FIELDS)), dtype=np.int64)
+        for i, response in enumerate(responses):
+            usage = response.usage
+            if usage:
+                usages[i] = [usage.get(name) or 0 for name in _USAGE_FIELDS]
+        totals = usages.sum(axis=0).tolist()
+    else:
+        totals = [0] * len(_USAGE_FIELDS)
+        for response in responses:
+            usage = response.usage
+            if usage:
+                for j, name in enumerate(_USAGE_FIELDS):
+                    totals[j] += usage.get(name) or 0
+    return dict(zip(_USAGE_FIELDS, totals))
+
 def messages_to_dict(messages: List[Message]) -> List[Dict[str, Any]]:
-    """Convert Message objects to dictionary format"""
-    result = []
-    for msg in messages:
-        msg_dict = {
-            "role": msg.role.value,
-            "content": msg.content,
-        }
-        if msg.tool_call_id:
-            msg_dict["tool_call_id"] = msg.tool_call_id
-        if msg.name:
-            msg_dict["name"] = msg.name
-        if hasattr(msg, 'tool_calls') and msg.tool_calls:
-            msg_dict["tool_calls"] = [
-                {
-                    "id": tc.id,
-                    "name": tc.name,
-                    "arguments": tc.arguments
-                } for tc in msg.tool_calls
-            ]
-        result.append(msg_dict)
+    """
+    Convert Message objects to dictionary format.
+    
+    Each message's dict is built once and reused on later calls, so a
+    growing conversation only pays for its new messages. Treat the
+    returned dicts as read-only.
+    """
+    return [msg._serialized or _message_to_dict(msg) for msg in messages]
+
+def _message_to_dict(msg: Message) -> Dict[str, Any]:
+    """Build and cache the dictionary form of a single message"""
+    msg_dict = {
+        "role": msg.role.value,
+        "content": msg.content,
+    }
+    if msg.tool_call_id:
+        msg_dict["tool_call_id"] = msg.tool_call_id
+    if msg.name:
+        msg_dict["name"] = msg.name
+    if msg.tool_call_ids:
+        msg_dict["tool_call_ids"] = msg.tool_call_ids
+    if msg.tool_calls:
+        msg_dict["tool_calls"] = [
+            {
+                "id": tc.id,
+                "name": tc.name,
+                "arguments": tc.arguments
+            } for tc in msg.tool_calls
+        ]
+    object.__setattr__(msg, "_serialized", msg_dict)
+    return msg_dict
+
+def format_message_cached(
+    msg: Message,
+    formatter: Callable[[Message], Any],
+    key: Optional[Callable] = None
+) -> Any:
+    """
+    Apply a provider's message formatter once per message.
+    
+    Messages are immutable, so the formatted form is stored on the message
+    and reused whenever the conversation is resent. Treat the result as
+    read-only.
+    
+    Args:
+        msg: Message to format
+        formatter: Function producing the formatted form
+        key: Cache key for the formatter (defaults to the formatter itself);
+            pass an unbound function rather than a bound method
+    """
+    if key is None:
+        key = formatter
+    formatted = msg._formatted
+    if formatted is None:
+        formatted = {}
+        object.__setattr__(msg, "_formatted", formatted)
+    result = formatted.get(key)
+    if result is None:
+        result = formatted[key] = formatter(msg)
     return result
 
 def messages_from_dict(messages: List[Dict[str, Any]]) -> List[Message]:
     """Convert dictionary format to Message objects"""
     result = []
     for msg in messages:
-        role = MessageRole(msg["role"])
+        try:
+            role = _ROLE_BY_VALUE[msg["role"]]
+        except KeyError:
+            raise ValueError(f"{msg['role']!r} is not a valid MessageRole") from None
         result.append(Message(
             role=role,
             content=msg["content"],
             tool_call_id=msg.get("tool_call_id"),
-            name=msg.get("name")
+            name=msg.get("name"),
+            tool_call_ids=msg.get("tool_call_ids")
         ))
     return result
\ No newline at end of file
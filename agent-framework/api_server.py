@@ -209,7 +209,7 @@ def execute_single_tool(tool_name):
         kwargs = data.get('arguments', {})
         result = execute_tool(tool_name, **kwargs)
         
-        return jsonify(result)
+        return jsonify(result.to_dict())
     except Exception as e:
         return jsonify({
             'success': False,
@@ -2,12 +2,39 @@
 Demo script showing the OpenAI agent with function calling capabilities.
 """
 
+from collections import deque
+
 from agent import OpenAIAgent
 from tools import (
     calculator, get_current_time, generate_random_number, 
     word_count, convert_temperature, TOOL_SCHEMAS
 )
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+# Token budget for the conversation history sent with each request
+HISTORY_TOKEN_BUDGET = 4000
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens in text for the given model.
+    
+    Falls back to a rough four-characters-per-token estimate when
+    tiktoken is not installed or does not know the model.
+    """
+    if TIKTOKEN_AVAILABLE:
+        try:
+            return len(tiktoken.encoding_for_model(model).encode(text))
+        except KeyError:
+            pass
+    return len(text) // 4 + 1
+
 
 def create_demo_agent():
     """
@@ -110,7 +137,11 @@ def interactive_mode():
     print("💡 Try questions like: 'What's 15 + 23?', 'What time is it?', 'Convert 100F to Celsius'")
     print("-" * 70)
     
-    conversation_history = []
+    # History is bounded by tokens rather than message count; the system
+    # prompt lives on the agent, so evicting old turns never touches it
+    conversation_history = deque()
+    history_tokens = deque()
+    running_tokens = 0
     
     while True:
         user_input = input("\n👤 You: ").strip()
@@ -127,14 +158,17 @@ def interactive_mode():
             print(f"🤖 Agent: {response}")
             
             # Update conversation history
-            conversation_history.extend([
-                {"role": "user", "content": user_input},
-                {"role": "assistant", "content": response}
-            ])
+            for role, content in (("user", user_input), ("assistant", response)):
+                tokens = count_tokens(content, agent.model)
+                conversation_history.append({"role": role, "content": content})
+                history_tokens.append(tokens)
+                running_tokens += tokens
             
-            # Keep conversation history manageable
-            if len(conversation_history) > 20:
-                conversation_history = conversation_history[-20:]
+            # Drop the oldest user/assistant pairs until back under budget
+            while running_tokens > HISTORY_TOKEN_BUDGET and len(conversation_history) > 2:
+                for _ in range(2):
+                    conversation_history.popleft()
+                    running_tokens -= history_tokens.popleft()
                 
         except Exception as e:
             print(f"❌ Error: {e}")
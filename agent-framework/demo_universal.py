@@ -2,6 +2,8 @@
 Demo of the Universal Agent with the new AI provider interface
 """
 
+import sys
+
 from universal_agent import UniversalAgent, create_openai_agent, create_agent_with_tools
 from ai_interface import ProviderFactory
 from tools import (
@@ -98,6 +100,12 @@ def run_specific_tests():
     print("✅ Universal Agent demo completed!")
 
 
+def write_token(token: str):
+    """Write a streamed piece of the response as soon as it arrives"""
+    sys.stdout.write(token)
+    sys.stdout.flush()
+
+
 def interactive_mode():
     """Run the universal agent in interactive mode"""
     
@@ -127,10 +135,11 @@ def interactive_mode():
             continue
         
         try:
-            response = agent.chat(user_input)
-            print(f"🤖 Agent: {response}")
+            print("🤖 Agent: ", end="", flush=True)
+            agent.chat(user_input, stream_callback=write_token)
+            print()
         except Exception as e:
-            print(f"❌ Error: {e}")
+            print(f"\n❌ Error: {e}")
             if "API key" in str(e).lower():
                 print("💡 Set your OPENAI_API_KEY environment variable")
 
@@ -201,8 +210,6 @@ def showcase_interface_benefits():
 
 
 if __name__ == "__main__":
-    import sys
-    
     print("🎯 Universal AI Agent Demo")
     print("Choose an option:")
     print("1. Run specific tests (temperature, random numbers, etc.)")
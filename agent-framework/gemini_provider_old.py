@@ -2,30 +2,169 @@
 Google Gemini implementation of the AI interface
 """
 
+import hashlib
+import importlib.util
+import logging
 import os
-import json
-from typing import List, Optional, Dict, Any
-from dotenv import load_dotenv
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+import orjson
+from typing import Iterator, List, Optional, Dict, Any
 
 from ai_interface import (
-    AIProvider, AIResponse, Message, MessageRole, ToolCall, ToolDefinition
+    AIProvider, AIResponse, Message, MessageRole, ToolCall, ToolDefinition,
+    format_message_cached
 )
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-try:
-    from google import genai
-    GEMINI_AVAILABLE = True
-except ImportError:
+
+def _module_available(name: str) -> bool:
+    """Check whether a module can be imported without importing it"""
     try:
-        # Fallback to old API
-        import google.generativeai as genai_old
-        GEMINI_AVAILABLE = True
-        USING_OLD_API = True
-    except ImportError:
-        GEMINI_AVAILABLE = False
-        USING_OLD_API = False
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+GEMINI_AVAILABLE = _module_available("google.genai") or _module_available("google.generativeai")
+USING_OLD_API = GEMINI_AVAILABLE and not _module_available("google.genai")
+
+# The SDK pulls in grpc and protobuf, so it is imported (and .env loaded)
+# when the first provider is created rather than when this module loads
+genai = None
+_init_lock = threading.Lock()
+
+
+def _lazy_init():
+    """Import the Gemini SDK and load environment variables on first use"""
+    global genai
+    if genai is not None:
+        return
+    with _init_lock:
+        if genai is not None:
+            return
+        
+        # Load environment variables
+        from dotenv import load_dotenv
+        load_dotenv()
+        
+        if USING_OLD_API:
+            # Fallback to old API
+            import google.generativeai as sdk
+        else:
+            from google import genai as sdk
+        genai = sdk
+
+# Maximum GenerativeModel instances kept per provider, one per system instruction
+MODEL_POOL_SIZE = 32
+
+# Maximum chat sessions kept for continuing conversations
+SESSION_POOL_SIZE = 8
+
+# Maximum distinct sampling settings whose GenerationConfig is kept
+GEN_CONFIG_CACHE_SIZE = 64
+
+# Seconds to reuse the model list before asking the API again
+MODELS_CACHE_TTL = 300
+
+# Error message patterns, checked in order, and the label they map to
+_ERROR_PATTERNS = [
+    (re.compile(r"API_KEY|AUTHENTICATION", re.IGNORECASE), "Gemini API key error"),
+    (re.compile(r"QUOTA|RATE_LIMIT|429", re.IGNORECASE), "Gemini quota/rate limit exceeded"),
+    (re.compile(r"404|NOT_FOUND", re.IGNORECASE), "Gemini model not found"),
+]
+
+# Tool call IDs for the common case of a few calls per response
+_GEMINI_IDS = tuple(f"gemini_{i}" for i in range(32))
+
+
+def _tool_call_id(index: int) -> str:
+    """ID for the index-th tool call of a response"""
+    return _GEMINI_IDS[index] if index < len(_GEMINI_IDS) else f"gemini_{index}"
+
+
+# Gemini content roles
+_USER_ROLE = "user"
+_MODEL_ROLE = "model"
+_FUNCTION_ROLE = "function"
+
+
+# Clients by API key, shared so providers reuse one connection pool
+_CLIENT_CACHE: Dict[str, Any] = {}
+
+
+def _get_client(api_key: str):
+    """Get the shared genai.Client for an API key, creating it on first use"""
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        client = _CLIENT_CACHE[api_key] = genai.Client(api_key=api_key)
+    return client
+
+
+def _build_user_content(msg: Message) -> Dict[str, Any]:
+    """User message in Gemini format"""
+    return {
+        "role": _USER_ROLE,
+        "parts": [{"text": msg.content}]
+    }
+
+
+def _build_model_content(msg: Message) -> Dict[str, Any]:
+    """Assistant message, with any function calls, in Gemini format"""
+    parts = []
+    if msg.content:
+        parts.append({"text": msg.content})
+    
+    tool_calls = msg.tool_calls
+    if tool_calls:
+        for tool_call in tool_calls:
+            parts.append({
+                "function_call": {
+                    "name": tool_call.name,
+                    "args": tool_call.arguments
+                }
+            })
+    
+    return {
+        "role": _MODEL_ROLE,
+        "parts": parts
+    }
+
+
+def _build_function_content(msg: Message) -> Dict[str, Any]:
+    """
+    Tool result in Gemini format.
+    
+    A batched message carries several results, each becoming its own part.
+    """
+    if msg.tool_call_ids:
+        results = [(r["name"], r["output"]) for r in orjson.loads(msg.content)]
+    else:
+        results = [(msg.name, msg.content)]
+    return {
+        "role": _FUNCTION_ROLE,
+        "parts": [
+            {
+                "function_response": {
+                    "name": name,
+                    "response": {"result": output}
+                }
+            }
+            for name, output in results
+        ]
+    }
+
+
+# Converters by role; system messages have none and become the system instruction
+_ROLE_BUILDERS = {
+    MessageRole.USER: _build_user_content,
+    MessageRole.ASSISTANT: _build_model_content,
+    MessageRole.TOOL: _build_function_content,
+}
 
 
 class GeminiProvider(AIProvider):
@@ -34,6 +173,7 @@ class GeminiProvider(AIProvider):
     def __init__(self, model_name: str = "gemini-2.5-flash", api_key: Optional[str] = None):
         if not GEMINI_AVAILABLE:
             raise ImportError("google-genai library not installed. Run: pip install google-genai")
+        _lazy_init()
         
         super().__init__(model_name, api_key)
         
@@ -43,23 +183,52 @@ class GeminiProvider(AIProvider):
             raise ValueError("GEMINI_API_KEY not found. Set it in your .env file or pass as parameter.")
         
         # Use new unified SDK
-        self.client = genai.Client(api_key=api_key)
+        self.client = _get_client(api_key)
         self.model_name = model_name
         
+        # Chat sessions by history key, least recently stored first
+        self._sessions: "OrderedDict[bytes, Any]" = OrderedDict()
+        
+        # GenerationConfig by (temperature, max_tokens, extra parameters)
+        self._gen_config_cache: Dict[tuple, Any] = {}
+        
+        # (fetch time, model names) from the last successful list_models()
+        self._models_cache: Optional[tuple] = None
+        
+        # Models by system instruction hash, least recently used first
+        self._model_pool: "OrderedDict[bytes, Any]" = OrderedDict()
+        
+        # Function declarations, rebuilt only when the toolset changes
+        self._cached_declarations: Optional[List[Dict[str, Any]]] = None
+        self._cached_declarations_version = -1
+        
         # Gemini models that support function calling
         self.function_calling_models = {
             "gemini-1.5-pro", "gemini-1.5-flash", "gemini-2.0-flash", 
             "gemini-2.5-flash", "gemini-1.5-pro-latest", "gemini-1.5-flash-latest"
         }
         
+        # The model is fixed for the provider's lifetime, so check support once
+        self._supports_fc = any(model in model_name for model in self.function_calling_models)
+        self._tools_enabled = False
+        
     def supports_function_calling(self) -> bool:
         """Check if this Gemini model supports function calling"""
-        return any(model in self.model_name for model in self.function_calling_models)
+        return self._supports_fc
+    
+    def _invalidate_tools_payload(self):
+        """Also recompute whether tools should be sent with requests"""
+        super()._invalidate_tools_payload()
+        self._tools_enabled = self._supports_fc and bool(self.tools)
     
     def supports_system_prompt(self) -> bool:
         """Gemini supports system instructions"""
         return True
     
+    def supports_batched_tool_results(self) -> bool:
+        """Gemini takes several function responses in one turn"""
+        return True
+    
     def _convert_tools_to_gemini_format(self) -> List[Dict[str, Any]]:
         """Convert our tool definitions to Gemini's format"""
         tools = []
@@ -79,93 +248,183 @@ class GeminiProvider(AIProvider):
         
         return tools
     
+    def _get_model(self, system_instruction: Optional[str]):
+        """Get a GenerativeModel for a system instruction, reusing pooled ones"""
+        key = hashlib.blake2b((system_instruction or "").encode()).digest()
+        model = self._model_pool.get(key)
+        if model is not None:
+            self._model_pool.move_to_end(key)
+            return model
+        
+        model = genai.GenerativeModel(
+            model_name=self.model_name,
+            system_instruction=system_instruction
+        )
+        self._model_pool[key] = model
+        if len(self._model_pool) > MODEL_POOL_SIZE:
+            self._model_pool.popitem(last=False)
+        return model
+    
+    def _session_key(self, system_instruction: Optional[str], history: List[Dict[str, Any]]) -> bytes:
+        """Key identifying a chat session by its system instruction and history"""
+        return hashlib.blake2b(orjson.dumps([system_instruction, history])).digest()
+    
+    def _store_session(
+        self,
+        chat,
+        system_instruction: Optional[str],
+        conversation_history: List[Dict[str, Any]],
+        result: AIResponse
+    ):
+        """
+        Keep a chat session for the next turn.
+        
+        After send_message the session holds the history plus the model's
+        reply, so it is stored under the key the next turn's history will
+        have once the caller appends that reply. The reply is appended to
+        conversation_history in place.
+        """
+        reply = _build_model_content(Message(
+            role=MessageRole.ASSISTANT,
+            content=result.content or "",
+            tool_calls=result.tool_calls
+        ))
+        if reply["parts"]:
+            conversation_history.append(reply)
+        key = self._session_key(system_instruction, conversation_history)
+        self._sessions[key] = chat
+        if len(self._sessions) > SESSION_POOL_SIZE:
+            self._sessions.popitem(last=False)
+    
+    def _get_generation_config(self, temperature: float, max_tokens: Optional[int], **kwargs):
+        """Get a GenerationConfig for these sampling parameters, built once per setting"""
+        try:
+            key = (temperature, max_tokens, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            # Unhashable parameters can't be cached
+            key = None
+        
+        if key is not None:
+            generation_config = self._gen_config_cache.get(key)
+            if generation_config is not None:
+                return generation_config
+        
+        generation_config = genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens
+        )
+        
+        # Add any additional Gemini-specific parameters
+        for name, value in kwargs.items():
+            if hasattr(generation_config, name):
+                setattr(generation_config, name, value)
+        
+        if key is not None:
+            if len(self._gen_config_cache) >= GEN_CONFIG_CACHE_SIZE:
+                self._gen_config_cache.clear()
+            self._gen_config_cache[key] = generation_config
+        return generation_config
+    
+    def _get_function_declarations(self) -> List[Dict[str, Any]]:
+        """Converted tool declarations, shared by the sync and async paths"""
+        if self._cached_declarations_version != self._tools_version:
+            self._cached_declarations = self._convert_tools_to_gemini_format()
+            self._cached_declarations_version = self._tools_version
+        return self._cached_declarations
+    
+    def _serialize_tools(self) -> Optional[List[Any]]:
+        """Tool protos for generate_content, cached between calls"""
+        gemini_tools = self._get_function_declarations()
+        if not gemini_tools:
+            return None
+        return [genai.protos.Tool(function_declarations=gemini_tools)]
+    
     def _convert_messages_to_gemini_format(self, messages: List[Message]) -> tuple:
-        """Convert our messages to Gemini's format"""
+        """
+        Convert our messages to Gemini's format.
+        
+        Returns:
+            Tuple of (system instruction, conversation history, index of the
+            last user turn in the history or -1 if there is none)
+        """
         system_instruction = None
-        conversation_history = []
+        conversation_history = [None] * len(messages)
+        count = 0
+        last_user_idx = -1
+        builders = _ROLE_BUILDERS
         
         for msg in messages:
-            if msg.role == MessageRole.SYSTEM:
+            builder = builders.get(msg.role)
+            if builder is None:
+                # System messages become the system instruction
                 system_instruction = msg.content
-            elif msg.role == MessageRole.USER:
-                conversation_history.append({
-                    "role": "user",
-                    "parts": [{"text": msg.content}]
-                })
-            elif msg.role == MessageRole.ASSISTANT:
-                # Handle assistant messages with potential tool calls
-                parts = []
-                if msg.content:
-                    parts.append({"text": msg.content})
-                
-                # Add function calls if present
-                if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                    for tool_call in msg.tool_calls:
-                        parts.append({
-                            "function_call": {
-                                "name": tool_call.name,
-                                "args": tool_call.arguments
-                            }
-                        })
-                
-                conversation_history.append({
-                    "role": "model",
-                    "parts": parts
-                })
-            elif msg.role == MessageRole.TOOL:
-                # Function response in Gemini format
-                conversation_history.append({
-                    "role": "function",
-                    "parts": [{
-                        "function_response": {
-                            "name": msg.name,
-                            "response": {"result": msg.content}
-                        }
-                    }]
-                })
-        
-        return system_instruction, conversation_history
+                continue
+            # Replayed history reuses the dicts built the first time it was sent
+            content = format_message_cached(msg, builder)
+            if not content["parts"]:
+                # Gemini rejects turns without parts (e.g. an empty assistant reply)
+                continue
+            if builder is _build_user_content:
+                last_user_idx = count
+            conversation_history[count] = content
+            count += 1
+        
+        del conversation_history[count:]
+        return system_instruction, conversation_history, last_user_idx
     
     def _convert_gemini_response(self, response) -> AIResponse:
         """Convert Gemini response to our standard format"""
         content = ""
         tool_calls = []
+        usage = None
+        make_call = ToolCall
         
         try:
             # Try to get text content directly first
-            if hasattr(response, 'text') and response.text:
-                content = response.text
+            text = getattr(response, 'text', None)
+            if text:
+                content = text
             
             # Check for function calls in candidates
-            if hasattr(response, 'candidates') and response.candidates:
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
-                    for part in candidate.content.parts:
-                        if hasattr(part, 'function_call') and part.function_call:
-                            func_call = part.function_call
-                            if hasattr(func_call, 'name') and func_call.name:  # Only add if name exists
-                                tool_calls.append(ToolCall(
-                                    id=f"gemini_{len(tool_calls)}",  # Generate unique ID
-                                    name=func_call.name,
-                                    arguments=dict(func_call.args) if func_call.args else {}
-                                ))
-                        elif hasattr(part, 'text') and part.text:
-                            content = part.text
+            candidates = getattr(response, 'candidates', None)
+            if candidates:
+                parts = getattr(getattr(candidates[0], 'content', None), 'parts', None)
+                for part in parts or ():
+                    func_call = getattr(part, 'function_call', None)
+                    if func_call:
+                        name = getattr(func_call, 'name', None)
+                        if name:  # Only add if name exists
+                            # The unified SDK already returns a plain dict
+                            args = func_call.args
+                            if not args:
+                                args = {}
+                            elif type(args) is not dict:
+                                args = dict(args)
+                            tool_calls.append(make_call(
+                                id=_tool_call_id(len(tool_calls)),  # Generate unique ID
+                                name=sys.intern(name),
+                                arguments=args
+                            ))
+                    else:
+                        part_text = getattr(part, 'text', None)
+                        if part_text:
+                            content = part_text
             
             # Extract usage information if available
-            usage = None
-            if hasattr(response, 'usage_metadata'):
+            usage_metadata = getattr(response, 'usage_metadata', None)
+            if usage_metadata is not None:
                 usage = {
-                    "prompt_tokens": getattr(response.usage_metadata, 'prompt_token_count', 0),
-                    "completion_tokens": getattr(response.usage_metadata, 'candidates_token_count', 0),
-                    "total_tokens": getattr(response.usage_metadata, 'total_token_count', 0)
+                    "prompt_tokens": getattr(usage_metadata, 'prompt_token_count', 0),
+                    "completion_tokens": getattr(usage_metadata, 'candidates_token_count', 0),
+                    "total_tokens": getattr(usage_metadata, 'total_token_count', 0)
                 }
         
         except Exception as e:
             # If we can't parse the response properly, return basic info
             content = str(response) if response else "No response"
-            print(f"Debug - Gemini response parsing error: {e}")
-            print(f"Debug - Response type: {type(response)}")
+            logger.debug("Gemini response parsing error: %s", e)
+            logger.debug("Response type: %s", type(response))
         
         # Ensure content is a string
         if not isinstance(content, str):
@@ -188,85 +447,195 @@ class GeminiProvider(AIProvider):
         """Send messages to Gemini and get a response"""
         
         # Convert messages to Gemini format
-        system_instruction, conversation_history = self._convert_messages_to_gemini_format(messages)
+        system_instruction, conversation_history, last_user_idx = self._convert_messages_to_gemini_format(messages)
         
-        # Configure generation parameters
-        generation_config = genai.types.GenerationConfig(
-            temperature=temperature,
-            max_output_tokens=max_tokens
+        # Fail fast, before any config, model or tool setup
+        if not conversation_history:
+            raise ValueError("No conversation history provided (only SYSTEM message?)")
+        if last_user_idx < 0:
+            raise ValueError("No user message found in conversation history")
+        
+        # Deterministic requests are answered from the response cache if one is set
+        cache_key = self._chat_cache_key(
+            {
+                "system": system_instruction,
+                "history": conversation_history,
+                "max_tokens": max_tokens,
+                "options": kwargs
+            },
+            temperature
         )
+        cached = self._get_cached_chat_response(cache_key)
+        if cached is not None:
+            return cached
         
-        # Add any additional Gemini-specific parameters
-        for key, value in kwargs.items():
-            if hasattr(generation_config, key):
-                setattr(generation_config, key, value)
-        
-        # Prepare the model with system instruction if available
-        if system_instruction and system_instruction != self.model._system_instruction:
-            model = genai.GenerativeModel(
-                model_name=self.model_name,
-                system_instruction=system_instruction
-            )
-        else:
-            model = self.model
+        # Configure generation parameters
+        generation_config = self._get_generation_config(temperature, max_tokens, **kwargs)
+        
+        # Reuse a model already set up with this system instruction
+        model = self._get_model(system_instruction)
         
         # Add tools if available and model supports function calling
         tools = None
-        if self.tools and self.supports_function_calling():
-            gemini_tools = self._convert_tools_to_gemini_format()
-            if gemini_tools:
-                tools = [genai.protos.Tool(function_declarations=gemini_tools)]
+        if self._tools_enabled:
+            tools = self._get_tools_payload()
         
+        chat = None
         try:
             # Start a chat session
-            if conversation_history:
-                # Get the last message to send
-                last_message = conversation_history[-1] if conversation_history else None
-                if last_message and last_message["role"] == "user":
-                    # Use chat session for multi-turn conversations
-                    chat = model.start_chat(history=conversation_history[:-1])  # Exclude the last message
-                    message_text = last_message["parts"][0]["text"]
-                    response = chat.send_message(
-                        message_text,
-                        generation_config=generation_config,
-                        tools=tools
-                    )
-                else:
-                    # If last message isn't from user, try to find a user message
-                    user_messages = [msg for msg in conversation_history if msg["role"] == "user"]
-                    if user_messages:
-                        message_text = user_messages[-1]["parts"][0]["text"]
-                        response = model.generate_content(
-                            message_text,
-                            generation_config=generation_config,
-                            tools=tools
-                        )
-                    else:
-                        raise ValueError("No user message found in conversation history")
+            if last_user_idx == len(conversation_history) - 1:
+                # Use chat session for multi-turn conversations, continuing
+                # the session from the previous turn if this history extends it.
+                # The list is ours, so pop the last message rather than slice a copy.
+                last_message = conversation_history.pop()
+                session_key = self._session_key(system_instruction, conversation_history)
+                chat = self._sessions.pop(session_key, None)
+                if chat is None:
+                    chat = model.start_chat(history=conversation_history)
+                conversation_history.append(last_message)
+                message_text = last_message["parts"][0]["text"]
+                response = chat.send_message(
+                    message_text,
+                    generation_config=generation_config,
+                    tools=tools
+                )
             else:
-                # No conversation history - this shouldn't happen normally
-                raise ValueError("No conversation history provided")
+                # If last message isn't from user, fall back to the latest user message
+                message_text = conversation_history[last_user_idx]["parts"][0]["text"]
+                response = model.generate_content(
+                    message_text,
+                    generation_config=generation_config,
+                    tools=tools
+                )
         
         except Exception as e:
-            # Handle Gemini-specific errors
-            error_str = str(e).upper()
-            if "API_KEY" in error_str or "AUTHENTICATION" in error_str:
-                raise ValueError(f"Gemini API key error: {e}")
-            elif "QUOTA" in error_str or "RATE_LIMIT" in error_str or "429" in str(e):
-                raise ValueError(f"Gemini quota/rate limit exceeded: {e}")
-            elif "404" in str(e) or "NOT_FOUND" in error_str:
-                raise ValueError(f"Gemini model not found: {e}")
-            else:
-                raise ValueError(f"Gemini API error: {e}")
+            raise self._convert_gemini_error(e)
+        
+        result = self._convert_gemini_response(response)
+        self._cache_chat_response(cache_key, result)
+        if chat is not None:
+            self._store_session(chat, system_instruction, conversation_history, result)
+        return result
+    
+    async def achat(
+        self, 
+        messages: List[Message], 
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AIResponse:
+        """Send messages to Gemini through the client's async API"""
+        system_instruction, conversation_history, _ = self._convert_messages_to_gemini_format(messages)
+        if not conversation_history:
+            raise ValueError("No conversation history provided (only SYSTEM message?)")
         
-        return self._convert_gemini_response(response)
+        cache_key = self._chat_cache_key(
+            {
+                "system": system_instruction,
+                "history": conversation_history,
+                "max_tokens": max_tokens,
+                "options": kwargs
+            },
+            temperature
+        )
+        cached = self._get_cached_chat_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        config = self._build_generate_config(system_instruction, temperature, max_tokens, **kwargs)
+        
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=conversation_history,
+                config=config
+            )
+        except Exception as e:
+            raise self._convert_gemini_error(e)
+        
+        result = self._convert_gemini_response(response)
+        self._cache_chat_response(cache_key, result)
+        return result
+    
+    def chat_stream(
+        self, 
+        messages: List[Message], 
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[AIResponse]:
+        """Send messages to Gemini and stream the response as it is generated"""
+        system_instruction, conversation_history, _ = self._convert_messages_to_gemini_format(messages)
+        if not conversation_history:
+            raise ValueError("No conversation history provided (only SYSTEM message?)")
+        config = self._build_generate_config(system_instruction, temperature, max_tokens, **kwargs)
+        
+        tool_calls = []
+        usage = None
+        try:
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=conversation_history,
+                config=config
+            ):
+                parsed = self._convert_gemini_response(chunk)
+                if parsed.content:
+                    yield AIResponse(content=parsed.content)
+                
+                # Function calls can arrive in any chunk; renumber across the stream
+                for tool_call in parsed.tool_calls:
+                    tool_calls.append(ToolCall(
+                        id=_tool_call_id(len(tool_calls)),
+                        name=tool_call.name,
+                        arguments=tool_call.arguments
+                    ))
+                usage = parsed.usage or usage
+        except Exception as e:
+            raise self._convert_gemini_error(e)
+        
+        yield AIResponse(content=None, tool_calls=tool_calls, finish_reason="stop", usage=usage)
+    
+    def _build_generate_config(
+        self,
+        system_instruction: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Generation config for the unified SDK's generate_content calls"""
+        config = {"temperature": temperature}
+        if max_tokens:
+            config["max_output_tokens"] = max_tokens
+        if system_instruction:
+            config["system_instruction"] = system_instruction
+        if self._tools_enabled:
+            config["tools"] = [{"function_declarations": self._get_function_declarations()}]
+        
+        # Add any additional Gemini-specific parameters
+        config.update(kwargs)
+        return config
+    
+    def _convert_gemini_error(self, e: Exception) -> ValueError:
+        """Map a Gemini API exception to a descriptive error"""
+        error_str = str(e)
+        for pattern, label in _ERROR_PATTERNS:
+            if pattern.search(error_str):
+                return ValueError(f"{label}: {e}")
+        return ValueError(f"Gemini API error: {e}")
     
     def get_available_models(self) -> List[str]:
-        """Get list of available Gemini models"""
+        """Get list of available Gemini models, cached for MODELS_CACHE_TTL seconds"""
+        if self._models_cache is not None:
+            fetched_at, models = self._models_cache
+            if time.monotonic() - fetched_at < MODELS_CACHE_TTL:
+                return list(models)
+        
         try:
             models = genai.list_models()
-            return [model.name.replace('models/', '') for model in models 
-                   if 'generateContent' in model.supported_generation_methods]
+            model_names = [model.name.replace('models/', '') for model in models 
+                           if 'generateContent' in model.supported_generation_methods]
+            self._models_cache = (time.monotonic(), model_names)
+            return list(model_names)
         except Exception:
             # Return common models if API call fails
             return [
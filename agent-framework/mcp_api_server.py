@@ -2,17 +2,33 @@
 """
 Enhanced REST API Server with MCP Support
 Provides structured tool access via Model Context Protocol integration
+
+Run with Uvicorn so async handlers share one event loop:
+    uvicorn mcp_api_server:app --loop uvloop --http httptools --port 4090
 """
 
 import os
 import sys
 import json
+import atexit
 import logging
+import queue
+import secrets
+import signal
 import traceback
 import asyncio
+import orjson
+from contextlib import asynccontextmanager
 from datetime import datetime
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 # Add parent directory to path for config loader
@@ -20,13 +36,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config_loader import get_config, get_config_loader
 
 from mcp_universal_agent import MCPUniversalAgent
-
-# Import providers to register them
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai-providers'))
-import openai_provider
-import gemini_provider
+from ai_interface import AIProvider
 
 # Load environment variables and configuration
 load_dotenv()
@@ -41,26 +51,185 @@ except Exception as e:
     print(f"❌ Failed to load configuration: {e}")
     exit(1)
 
-app = Flask(__name__)
-CORS(app, origins=config.api.cors_origins, methods=['GET', 'POST', 'OPTIONS'], allow_headers=['Content-Type', 'Authorization'])  # Enable CORS with configured origins
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson instead of the stdlib encoder"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the agent for the server's lifetime, on the loop that serves requests"""
+    if await create_agent():
+        logger.info("✅ MCP Agent initialized successfully")
+    else:
+        logger.error("❌ Failed to initialize MCP agent")
+    
+    yield
+    
+    try:
+        if agent:
+            await agent.cleanup()
+            # A failed initialize() leaves the agent without a provider
+            if agent.provider is not None:
+                await agent.provider.aclose()
+    finally:
+        # Providers share these clients, so they are only closed once serving ends
+        await AIProvider.aclose_shared_clients()
+        logger.info("MCP Agent shut down")
+
+app = FastAPI(
+    title="Universal AI Chat MCP API",
+    version="2.0.0-mcp",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=config.api.cors_origins,
+    allow_methods=['GET', 'POST', 'OPTIONS'],
+    allow_headers=['Content-Type', 'Authorization']
+)  # Enable CORS with configured origins
 
-# Configure logging
+# Configure logging; records are formatted on the caller and written to the
+# file and console by a listener thread, so handlers never block the event loop
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(
+    _log_queue,
+    logging.FileHandler('mcp_api_server.log'),
+    logging.StreamHandler(),
+    respect_handler_level=True
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('mcp_api_server.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
+# Per-request logging is DEBUG-level and only enabled in debug mode
+if config.development.debug_mode:
+    logger.setLevel(logging.DEBUG)
+
+# Request defaults, read once instead of walking the config on every request
+DEFAULT_MODEL = config.models.default_model
+DEFAULT_PROVIDER = config.models.default_provider
+DEFAULT_TEMPERATURE = config.models.temperature_default
+DEFAULT_MAX_TOKENS = config.models.max_tokens_default
+MCP_ENABLED = config.mcp.enabled
+
+@lru_cache(maxsize=1)
+def _all_models() -> tuple:
+    """Enabled models from the TOML configuration"""
+    return tuple(config_loader.get_all_models())
+
+def _reload_config(signum=None, frame=None):
+    """Re-read config.toml and drop everything derived from it"""
+    global config, DEFAULT_MODEL, DEFAULT_PROVIDER, DEFAULT_TEMPERATURE, DEFAULT_MAX_TOKENS, MCP_ENABLED
+    try:
+        config = config_loader.load()
+    except Exception as e:
+        logger.error(f"Failed to reload configuration: {e}")
+        return
+    
+    DEFAULT_MODEL = config.models.default_model
+    DEFAULT_PROVIDER = config.models.default_provider
+    DEFAULT_TEMPERATURE = config.models.temperature_default
+    DEFAULT_MAX_TOKENS = config.models.max_tokens_default
+    MCP_ENABLED = config.mcp.enabled
+    _all_models.cache_clear()
+    _invalidate_response_cache()
+    logger.info("Configuration reloaded")
+
+# `kill -HUP <pid>` picks up config.toml edits without a restart
+if hasattr(signal, 'SIGHUP'):
+    signal.signal(signal.SIGHUP, _reload_config)
+
+# Request bodies; omitted settings fall back to the current config defaults,
+# which is why the defaults are factories rather than values
+class ChatMessage(BaseModel):
+    """One message of a conversation sent by the client"""
+    role: str = 'user'
+    content: str = ''
+
+class ChatRequest(BaseModel):
+    """Body of POST /chat"""
+    messages: List[ChatMessage] = Field(min_length=1)
+    model: str = Field(default_factory=lambda: DEFAULT_MODEL)
+    provider: str = Field(default_factory=lambda: DEFAULT_PROVIDER)
+    tools_enabled: bool = Field(default_factory=lambda: MCP_ENABLED)
+    stream: bool = False
+
+class SimpleChatRequest(BaseModel):
+    """Body of POST /chat/simple"""
+    message: str = Field(min_length=1)
+    model: str = Field(default_factory=lambda: DEFAULT_MODEL)
+    provider: str = Field(default_factory=lambda: DEFAULT_PROVIDER)
+    temperature: float = Field(default_factory=lambda: DEFAULT_TEMPERATURE)
+    max_tokens: int = Field(default_factory=lambda: DEFAULT_MAX_TOKENS)
+    use_tools: bool = Field(default_factory=lambda: MCP_ENABLED)
+    stream: bool = False
 
 # Global agent instance
 agent: MCPUniversalAgent = None
 
+# Serialized bodies for endpoints that only change when the agent is
+# created or switched, keyed by endpoint
+_response_cache: Dict[Any, Any] = {}
+
+def _invalidate_response_cache():
+    """Drop cached endpoint bodies after the agent changes"""
+    _response_cache.clear()
+
+def _json_bytes(body: bytes) -> Response:
+    """Wrap an already-serialized JSON body in a response"""
+    return Response(body, media_type='application/json')
+
+async def _stream_chat(request_id: str, message: str, temperature: float, max_tokens: int,
+                       use_tools: bool, final_fields: Dict[str, Any]):
+    """Relay agent stream events as server-sent events"""
+    try:
+        async for event in agent.chat_with_thinking_stream(
+            message,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            use_tools=use_tools
+        ):
+            if 'response' in event:
+                event = {**event, **final_fields}
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
+    except Exception as e:
+        logger.error(f"[{request_id}] Streaming chat failed: {e}")
+        logger.error(f"[{request_id}] Chat traceback: {traceback.format_exc()}")
+        yield b"data: " + orjson.dumps({'error': f'Chat generation failed: {str(e)}'}) + b"\n\n"
+
+async def _get_tools_payload():
+    """Return the serialized /tools body with its tool and category counts"""
+    cached = _response_cache.get('tools')
+    if cached is None:
+        tools = await agent.get_available_tools()
+        
+        # Group tools by category
+        categories = {}
+        for tool in tools:
+            category = tool.get('category', 'General')
+            if category not in categories:
+                categories[category] = []
+            categories[category].append(tool)
+        
+        body = orjson.dumps({
+            'tools': tools,
+            'categories': categories,
+            'total': len(tools)
+        })
+        cached = _response_cache['tools'] = (body, len(tools), len(categories))
+    return cached
+
 async def create_agent():
     """Create and initialize the MCP-enhanced universal agent"""
     global agent
+    _invalidate_response_cache()
     
     try:
         logger.info("Initializing MCP Universal Agent...")
@@ -92,6 +261,8 @@ Be helpful, accurate, and make full use of the available structured tools."""
         success = await agent.initialize()
         
         if success:
+            # Open the provider's connection pool on the serving loop
+            await agent.provider.startup()
             tools = await agent.get_available_tools()
             logger.info(f"Successfully initialized agent with {len(tools)} MCP tools")
             return True
@@ -104,30 +275,31 @@ Be helpful, accurate, and make full use of the available structured tools."""
         logger.error(f"Traceback: {traceback.format_exc()}")
         return False
 
-# Initialize agent at startup
-async def init_agent():
-    """Initialize the agent asynchronously"""
-    await create_agent()
-
 # Request logging middleware
-@app.before_request
-def log_request_info():
-    logger.info(f"Request: {request.method} {request.path}")
-    if request.is_json and request.get_json():
-        # Log request data but mask sensitive info
-        data = request.get_json()
-        safe_data = {k: (v if k not in ['api_key', 'password'] else '***') for k, v in data.items()}
-        logger.info(f"Request data: {safe_data}")
-
-@app.after_request
-def log_response_info(response):
-    logger.info(f"Response: {response.status_code} for {request.method} {request.path}")
+@app.middleware("http")
+async def log_request_info(request: Request, call_next):
+    if not logger.isEnabledFor(logging.DEBUG):
+        return await call_next(request)
+    
+    logger.debug("Request: %s %s", request.method, request.url.path)
+    if request.headers.get('content-type', '').startswith('application/json'):
+        try:
+            data = orjson.loads(await request.body())
+        except orjson.JSONDecodeError:
+            data = None
+        if isinstance(data, dict) and data:
+            # Log request data but mask sensitive info
+            safe_data = {k: (v if k not in ['api_key', 'password'] else '***') for k, v in data.items()}
+            logger.debug("Request data: %s", safe_data)
+    
+    response = await call_next(request)
+    logger.debug("Response: %s for %s %s", response.status_code, request.method, request.url.path)
     return response
 
-@app.route('/health', methods=['GET'])
+@app.get('/health')
 def health_check():
     """Health check endpoint"""
-    logger.info("Health check requested")
+    logger.debug("Health check requested")
     try:
         response = {
             'status': 'healthy',
@@ -141,267 +313,255 @@ def health_check():
             summary = agent.get_conversation_summary()
             response['agent_info'] = summary
         
-        logger.info(f"Health check response: {response}")
-        return jsonify(response)
+        logger.debug("Health check response: %s", response)
+        return response
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return jsonify({'error': 'Health check failed', 'details': str(e)}), 500
+        return ORJSONResponse({'error': 'Health check failed', 'details': str(e)}, status_code=500)
 
-@app.route('/models', methods=['GET'])
+@app.get('/models')
 def get_models():
     """Get available AI models"""
-    logger.info("Models endpoint requested")
+    logger.debug("Models endpoint requested")
     try:
         if not agent:
             logger.error("Agent not available for models endpoint")
-            return jsonify({'error': 'Agent not available'}), 500
-        
-        # Get models from TOML configuration
-        models = config_loader.get_all_models()
+            return ORJSONResponse({'error': 'Agent not available'}, status_code=500)
+        
+        body = _response_cache.get('models')
+        if body is None:
+            # Get models from TOML configuration
+            models = _all_models()
+            body = _response_cache['models'] = orjson.dumps({
+                'models': models,
+                'total': len(models)
+            })
         
-        logger.info(f"Returning {len(models)} models")
-        return jsonify({
-            'models': models,
-            'total': len(models)
-        })
+        logger.debug("Returning cached model list")
+        return _json_bytes(body)
         
     except Exception as e:
         logger.error(f"Models endpoint failed: {e}")
         logger.error(f"Models endpoint traceback: {traceback.format_exc()}")
-        return jsonify({'error': str(e)}), 500
+        return ORJSONResponse({'error': str(e)}, status_code=500)
 
-@app.route('/tools', methods=['GET'])
+@app.get('/tools')
 async def get_available_tools():
     """Get all available MCP tools with descriptions"""
-    logger.info("Tools endpoint requested")
+    logger.debug("Tools endpoint requested")
     try:
         if not agent:
             logger.error("Agent not available for tools endpoint")
-            return jsonify({'error': 'Agent not available'}), 500
+            return ORJSONResponse({'error': 'Agent not available'}, status_code=500)
         
-        tools = await agent.get_available_tools()
+        body, tools_count, categories_count = await _get_tools_payload()
         
-        # Group tools by category
-        categories = {}
-        for tool in tools:
-            category = tool.get('category', 'General')
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(tool)
-        
-        logger.info(f"Returning {len(tools)} MCP tools in {len(categories)} categories")
-        return jsonify({
-            'tools': tools,
-            'categories': categories,
-            'total': len(tools)
-        })
+        logger.debug("Returning %s MCP tools in %s categories", tools_count, categories_count)
+        return _json_bytes(body)
         
     except Exception as e:
         logger.error(f"Tools endpoint failed: {e}")
         logger.error(f"Tools endpoint traceback: {traceback.format_exc()}")
-        return jsonify({'error': str(e)}), 500
+        return ORJSONResponse({'error': str(e)}, status_code=500)
 
-@app.route('/chat', methods=['POST', 'OPTIONS'])
-async def chat_full():
+@app.post('/chat')
+async def chat_full(req: ChatRequest):
     """Enhanced chat endpoint with full conversation history and MCP tool support"""
-    if request.method == 'OPTIONS':
-        # Handle CORS preflight request
-        return '', 200
-    
-    request_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    logger.info(f"[{request_id}] Full chat endpoint requested")
+    # One clock read per request; the random suffix keeps concurrent ids unique
+    started = datetime.now()
+    request_id = f"{started:%Y%m%d_%H%M%S}_{secrets.token_hex(3)}"
+    timestamp = started.isoformat()
+    logger.debug("[%s] Full chat endpoint requested", request_id)
     
     try:
         if not agent:
             logger.error(f"[{request_id}] Agent not available")
-            return jsonify({'error': 'Agent not available'}), 500
-        
-        data = request.get_json()
-        if not data:
-            logger.error(f"[{request_id}] No request body provided")
-            return jsonify({'error': 'Request body required'}), 400
-        
-        messages = data.get('messages', [])
-        model = data.get('model', config.models.default_model)
-        provider = data.get('provider', config.models.default_provider)
-        tools_enabled = data.get('tools_enabled', config.mcp.enabled)
+            return ORJSONResponse({'error': 'Agent not available'}, status_code=500)
         
-        logger.info(f"[{request_id}] Full chat - Model: {model}, Provider: {provider}, Messages: {len(messages)}, Tools: {tools_enabled}")
-        
-        if not messages:
-            logger.error(f"[{request_id}] No messages provided")
-            return jsonify({'error': 'Messages required'}), 400
+        model, provider, tools_enabled = req.model, req.provider, req.tools_enabled
+        logger.debug("[%s] Full chat - Model: %s, Provider: %s, Messages: %s, Tools: %s", request_id, model, provider, len(req.messages), tools_enabled)
         
         # Switch provider if needed
         if agent.provider_name != provider or agent.model_name != model:
             try:
-                logger.info(f"[{request_id}] Switching to provider {provider} with model {model}")
-                agent.switch_provider(provider, model)
+                logger.info("[%s] Switching to provider %s with model %s", request_id, provider, model)
+                await agent.switch_provider(provider, model)
+                _invalidate_response_cache()
             except Exception as switch_error:
                 logger.error(f"[{request_id}] Provider switch failed: {switch_error}")
-                return jsonify({'error': f'Failed to switch to {provider}/{model}: {str(switch_error)}'}), 500
-        
-        # Build conversation context from message history
-        conversation_context = []
-        for msg in messages:
-            conversation_context.append(f"{msg.get('role', 'user')}: {msg.get('content', '')}")
-        
-        # Use the latest message as the main input
-        latest_message = messages[-1].get('content', '') if messages else ''
+                return ORJSONResponse({'error': f'Failed to switch to {provider}/{model}: {str(switch_error)}'}, status_code=500)
+        
+        # The agent keeps its own history, so only the latest message is sent
+        latest_message = req.messages[-1].content
+        
+        if req.stream:
+            # Send text as it is generated; the last event carries thinking steps
+            return StreamingResponse(
+                _stream_chat(request_id, latest_message, 0.7, 1000, tools_enabled, {
+                    'model': model,
+                    'provider': provider,
+                    'mcp_enabled': MCP_ENABLED,
+                    'tools_used': tools_enabled,
+                    'timestamp': timestamp
+                }),
+                media_type='text/event-stream'
+            )
         
         # Get response from MCP-enhanced agent with conversation context
         try:
-            logger.info(f"[{request_id}] Generating response with conversation history...")
+            logger.debug("[%s] Generating response with conversation history...", request_id)
             response_content, thinking_steps = await agent.chat_with_thinking(
                 latest_message,
                 temperature=0.7,
                 max_tokens=1000,
                 use_tools=tools_enabled
             )
-            logger.info(f"[{request_id}] Response generated, length: {len(response_content)}, thinking steps: {len(thinking_steps)}")
+            logger.debug("[%s] Response generated, length: %s, thinking steps: %s", request_id, len(response_content), len(thinking_steps))
             
-            return jsonify({
+            return {
                 'response': {
                     'content': response_content
                 },
                 'thinking_steps': thinking_steps,
                 'model': model,
                 'provider': provider,
-                'timestamp': datetime.now().isoformat(),
-                'mcp_enabled': config.mcp.enabled,
+                'timestamp': timestamp,
+                'mcp_enabled': MCP_ENABLED,
                 'tools_used': tools_enabled
-            })
+            }
             
         except Exception as chat_error:
             logger.error(f"[{request_id}] Chat generation failed: {chat_error}")
             logger.error(f"[{request_id}] Chat traceback: {traceback.format_exc()}")
-            return jsonify({'error': f'Chat generation failed: {str(chat_error)}'}), 500
+            return ORJSONResponse({'error': f'Chat generation failed: {str(chat_error)}'}, status_code=500)
         
     except Exception as e:
         logger.error(f"[{request_id}] Unexpected error in chat endpoint: {e}")
         logger.error(f"[{request_id}] Full traceback: {traceback.format_exc()}")
-        return jsonify({
+        return ORJSONResponse({
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+            'timestamp': timestamp
+        }, status_code=500)
 
-@app.route('/chat/simple', methods=['POST', 'OPTIONS'])
-async def chat_simple():
+@app.post('/chat/simple')
+async def chat_simple(req: SimpleChatRequest):
     """Enhanced chat endpoint with MCP tool support"""
-    if request.method == 'OPTIONS':
-        # Handle CORS preflight request
-        return '', 200
-    
-    request_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    logger.info(f"[{request_id}] Enhanced chat endpoint requested")
+    # One clock read per request; the random suffix keeps concurrent ids unique
+    started = datetime.now()
+    request_id = f"{started:%Y%m%d_%H%M%S}_{secrets.token_hex(3)}"
+    timestamp = started.isoformat()
+    logger.debug("[%s] Enhanced chat endpoint requested", request_id)
     
     try:
         if not agent:
             logger.error(f"[{request_id}] Agent not available")
-            return jsonify({'error': 'Agent not available'}), 500
-        
-        data = request.get_json()
-        if not data:
-            logger.error(f"[{request_id}] No request body provided")
-            return jsonify({'error': 'Request body required'}), 400
-        
-        message = data.get('message', '')
-        model = data.get('model', config.models.default_model)
-        provider = data.get('provider', config.models.default_provider)
-        temperature = data.get('temperature', config.models.temperature_default)
-        max_tokens = data.get('max_tokens', config.models.max_tokens_default)
-        use_tools = data.get('use_tools', config.mcp.enabled)
+            return ORJSONResponse({'error': 'Agent not available'}, status_code=500)
         
-        logger.info(f"[{request_id}] Enhanced chat - Model: {model}, Provider: {provider}, Message length: {len(message)}, Tools: {use_tools}")
-        
-        if not message:
-            logger.error(f"[{request_id}] No message provided")
-            return jsonify({'error': 'Message required'}), 400
+        message, model, provider, use_tools = req.message, req.model, req.provider, req.use_tools
+        temperature, max_tokens = req.temperature, req.max_tokens
+        logger.debug("[%s] Enhanced chat - Model: %s, Provider: %s, Message length: %s, Tools: %s", request_id, model, provider, len(message), use_tools)
         
         # Switch provider if needed
         if agent.provider_name != provider or agent.model_name != model:
             try:
-                logger.info(f"[{request_id}] Switching to provider {provider} with model {model}")
-                agent.switch_provider(provider, model)
+                logger.info("[%s] Switching to provider %s with model %s", request_id, provider, model)
+                await agent.switch_provider(provider, model)
+                _invalidate_response_cache()
             except Exception as switch_error:
                 logger.error(f"[{request_id}] Provider switch failed: {switch_error}")
-                return jsonify({'error': f'Failed to switch to {provider}/{model}: {str(switch_error)}'}), 500
+                return ORJSONResponse({'error': f'Failed to switch to {provider}/{model}: {str(switch_error)}'}, status_code=500)
+        
+        if req.stream:
+            # Send text as it is generated; the last event carries thinking steps
+            return StreamingResponse(
+                _stream_chat(request_id, message, temperature, max_tokens, use_tools, {
+                    'model': model,
+                    'provider': provider,
+                    'mcp_enabled': True,
+                    'tools_used': use_tools,
+                    'timestamp': timestamp
+                }),
+                media_type='text/event-stream'
+            )
         
         # Get response from MCP-enhanced agent with thinking steps
         try:
-            logger.info(f"[{request_id}] Generating enhanced response with MCP tools...")
-            response_content, thinking_steps = await agent.chat_with_thinking(
+            logger.debug("[%s] Generating enhanced response with MCP tools...", request_id)
+            body = await agent.chat_with_thinking_json(
                 message,
                 temperature=temperature,
                 max_tokens=max_tokens,
-                use_tools=use_tools
+                use_tools=use_tools,
+                extra={
+                    'model': model,
+                    'provider': provider,
+                    'timestamp': timestamp,
+                    'mcp_enabled': True,
+                    'tools_used': use_tools
+                }
             )
-            logger.info(f"[{request_id}] Enhanced response generated, length: {len(response_content)}, thinking steps: {len(thinking_steps)}")
+            logger.debug("[%s] Enhanced response generated, %s bytes", request_id, len(body))
             
-            return jsonify({
-                'response': response_content,
-                'thinking_steps': thinking_steps,
-                'model': model,
-                'provider': provider,
-                'timestamp': datetime.now().isoformat(),
-                'mcp_enabled': True,
-                'tools_used': use_tools
-            })
+            # Already encoded, so FastAPI's jsonable_encoder pass is skipped too
+            return Response(body, media_type='application/json')
             
         except Exception as chat_error:
             logger.error(f"[{request_id}] Enhanced chat generation failed: {chat_error}")
             logger.error(f"[{request_id}] Chat traceback: {traceback.format_exc()}")
-            return jsonify({'error': f'Enhanced chat generation failed: {str(chat_error)}'}), 500
+            return ORJSONResponse({'error': f'Enhanced chat generation failed: {str(chat_error)}'}, status_code=500)
         
     except Exception as e:
         logger.error(f"[{request_id}] Unexpected error in enhanced chat endpoint: {e}")
         logger.error(f"[{request_id}] Full traceback: {traceback.format_exc()}")
-        return jsonify({
+        return ORJSONResponse({
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+            'timestamp': timestamp
+        }, status_code=500)
 
-@app.route('/agent/summary', methods=['GET'])
+@app.get('/agent/summary')
 def get_agent_summary():
     """Get current agent conversation summary"""
     try:
         if not agent:
-            return jsonify({'error': 'Agent not available'}), 500
+            return ORJSONResponse({'error': 'Agent not available'}, status_code=500)
         
         summary = agent.get_conversation_summary()
-        return jsonify(summary)
+        return summary
         
     except Exception as e:
         logger.error(f"Agent summary failed: {e}")
-        return jsonify({'error': str(e)}), 500
+        return ORJSONResponse({'error': str(e)}, status_code=500)
 
-@app.route('/agent/clear', methods=['POST'])
+@app.post('/agent/clear')
 def clear_agent():
     """Clear agent conversation history"""
     try:
         if not agent:
-            return jsonify({'error': 'Agent not available'}), 500
+            return ORJSONResponse({'error': 'Agent not available'}, status_code=500)
         
         agent.clear_conversation()
-        return jsonify({'success': True, 'message': 'Conversation cleared'})
+        return {'success': True, 'message': 'Conversation cleared'}
         
     except Exception as e:
         logger.error(f"Agent clear failed: {e}")
-        return jsonify({'error': str(e)}), 500
+        return ORJSONResponse({'error': str(e)}, status_code=500)
 
-@app.route('/config', methods=['GET'])
+@app.get('/config')
 async def get_config_endpoint():
     """Get current server configuration for frontend"""
     try:
         tools_count = 0
-        if agent and config.mcp.enabled:
+        if agent and MCP_ENABLED:
             try:
-                tools = await agent.get_available_tools()
-                tools_count = len(tools)
+                _, tools_count, _ = await _get_tools_payload()
             except:
                 tools_count = 0
         
-        return jsonify({
+        body = _response_cache.get(('config', tools_count))
+        if body is not None:
+            return _json_bytes(body)
+        
+        body = _response_cache[('config', tools_count)] = orjson.dumps({
             'server': {
                 'apiHost': config.server.api_host,
                 'apiPort': config.server.api_port,
@@ -418,45 +578,58 @@ async def get_config_endpoint():
                 'showDebugInfo': config.ui.show_debug_info
             },
             'mcp': {
-                'enabled': config.mcp.enabled,
+                'enabled': MCP_ENABLED,
                 'toolsAvailable': tools_count
             }
         })
+        return _json_bytes(body)
         
     except Exception as e:
         logger.error(f"Config endpoint failed: {e}")
-        return jsonify({'error': str(e)}), 500
+        return ORJSONResponse({'error': str(e)}, status_code=500)
+
+def _tail_lines(path: str, count: int, block_size: int = 4096) -> List[bytes]:
+    """Read the last count lines of a file by seeking backwards from the end"""
+    blocks = []
+    newlines = 0
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        # One newline more than requested, since the last line ends with one too
+        while position > 0 and newlines <= count:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size)
+            blocks.append(block)
+            newlines += block.count(b'\n')
+    
+    return b''.join(reversed(blocks)).splitlines()[-count:]
 
-@app.route('/logs', methods=['GET'])
-def get_logs():
+@app.get('/logs')
+def get_logs(lines: int = Query(50, ge=1)):
     """Get recent log entries for debugging"""
     try:
-        lines = int(request.args.get('lines', 50))
-        
         if not os.path.exists('mcp_api_server.log'):
-            return jsonify({'logs': [], 'message': 'No log file found'})
+            return {'logs': [], 'message': 'No log file found'}
         
-        with open('mcp_api_server.log', 'r') as f:
-            all_lines = f.readlines()
-            recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+        recent_lines = _tail_lines('mcp_api_server.log', lines)
         
-        return jsonify({
-            'logs': [line.strip() for line in recent_lines],
-            'total_lines': len(all_lines),
+        return {
+            'logs': [line.decode('utf-8', 'replace').strip() for line in recent_lines],
             'showing': len(recent_lines)
-        })
+        }
     except Exception as e:
         logger.error(f"Error reading logs: {e}")
-        return jsonify({'error': str(e)}), 500
+        return ORJSONResponse({'error': str(e)}, status_code=500)
 
-@app.errorhandler(404)
-def not_found(error):
-    logger.warning(f"404 error for {request.method} {request.path}")
-    return jsonify({
+@app.exception_handler(404)
+async def not_found(request: Request, error):
+    logger.warning(f"404 error for {request.method} {request.url.path}")
+    return ORJSONResponse({
         'error': 'Endpoint not found',
         'available_endpoints': [
             'GET /health',
-            'GET /models', 
+            'GET /models',
             'GET /tools',
             'GET /config',
             'GET /logs?lines=N',
@@ -465,44 +638,37 @@ def not_found(error):
             'POST /chat',
             'POST /chat/simple'
         ]
-    }), 404
+    }, status_code=404)
 
-@app.errorhandler(500)
-def internal_error(error):
+@app.exception_handler(RequestValidationError)
+async def invalid_request(request: Request, error: RequestValidationError):
+    logger.warning(f"Invalid request body for {request.method} {request.url.path}")
+    # Keep the 'error' key the chat UI reads, with pydantic's details alongside
+    return ORJSONResponse({
+        'error': 'Invalid request body',
+        'details': jsonable_encoder(error.errors())
+    }, status_code=422)
+
+@app.exception_handler(Exception)
+async def internal_error(request: Request, error):
     logger.error(f"500 error: {error}")
-    return jsonify({
+    return ORJSONResponse({
         'error': 'Internal server error',
         'timestamp': datetime.now().isoformat()
-    }), 500
+    }, status_code=500)
 
 if __name__ == '__main__':
-    logger.info("🚀 Starting Enhanced Universal AI Chat API Server with MCP...")
+    import uvicorn
     
-    # Initialize agent
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    logger.info("🚀 Starting Enhanced Universal AI Chat API Server with MCP...")
+    print("🚀 Starting Enhanced Universal AI Chat API Server with MCP...")
+    print("🔧 MCP (Model Context Protocol) enabled")
+    print("📋 Logs will be written to mcp_api_server.log")
     
-    try:
-        loop.run_until_complete(init_agent())
-        
-        if agent:
-            logger.info("✅ MCP Agent initialized successfully")
-            print("🚀 Starting Enhanced Universal AI Chat API Server with MCP...")
-            print("🔧 MCP (Model Context Protocol) enabled")
-            print("📋 Logs will be written to mcp_api_server.log")
-            
-            # Development server with configured port
-            app.run(
-                host=config.server.api_host,
-                port=config.server.api_port,
-                debug=config.development.debug_mode
-            )
-        else:
-            logger.error("❌ Failed to initialize MCP agent")
-            print("❌ Failed to initialize MCP agent - check logs")
-            
-    except Exception as e:
-        logger.error(f"Failed to start server: {e}")
-        print(f"❌ Failed to start server: {e}")
-    finally:
-        loop.close()
\ No newline at end of file
+    # Single-process server for local debugging; use the uvicorn CLI in production
+    uvicorn.run(
+        app,
+        host=config.server.api_host,
+        port=config.server.api_port,
+        log_level='debug' if config.development.debug_mode else 'info'
+    )
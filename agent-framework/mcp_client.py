@@ -4,14 +4,119 @@ Connects to FastMCP server to access structured tools via Model Context Protocol
 """
 
 import asyncio
-import json
+import hashlib
+import itertools
+import orjson
 import logging
-import subprocess
+import os
+import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 from dataclasses import dataclass
 
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+if MSGSPEC_AVAILABLE:
+    class RPCRequest(msgspec.Struct, omit_defaults=True):
+        """JSON-RPC request envelope"""
+        jsonrpc: str
+        id: int
+        method: str
+        params: Optional[Dict[str, Any]] = None
+    
+    class RPCResponse(msgspec.Struct):
+        """JSON-RPC response envelope; other members are ignored when decoding"""
+        id: Optional[int] = None
+        result: Any = None
+        error: Any = None
+    
+    _rpc_encoder = msgspec.json.Encoder()
+    _rpc_decoder = msgspec.json.Decoder(RPCResponse)
+    _RPC_DECODE_ERRORS = (msgspec.DecodeError,)
+else:
+    _RPC_DECODE_ERRORS = (orjson.JSONDecodeError, AttributeError)
+
+
+# Tool lists from earlier runs, one file per server script and version of its sources
+_TOOLS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcp_agent")
+
+
+def _tools_cache_path(server_path: str) -> Optional[str]:
+    """
+    Cache file for a server's tool list, or None if its sources can't be stat'ed.
+    
+    The key covers the script and the modification time of every Python file
+    next to it, so editing a tool module the server imports also misses.
+    """
+    key = hashlib.sha1(server_path.encode())
+    try:
+        server_dir = os.path.dirname(server_path)
+        for name in sorted(os.listdir(server_dir)):
+            if name.endswith(".py"):
+                path = os.path.join(server_dir, name)
+                key.update(f"\0{name}\0{os.path.getmtime(path)}".encode())
+    except OSError:
+        return None
+    return os.path.join(_TOOLS_CACHE_DIR, f"{key.hexdigest()}.json")
+
+
+# Notification sent once the initialize handshake succeeds; it never changes
+_INITIALIZED_NOTIFICATION = b'{"jsonrpc":"2.0","method":"notifications/initialized"}'
+
+
+@lru_cache(maxsize=None)
+def _request_prefix(method: str) -> bytes:
+    """Pre-encoded envelope of a request up to its id, shared by every call of a method"""
+    return b'{"jsonrpc":"2.0","method":' + orjson.dumps(method) + b',"id":'
+
+
+def _encode_request(request_id: int, method: str, params: Optional[Dict[str, Any]]) -> bytes:
+    """Serialize a JSON-RPC request, as a typed struct when msgspec is installed"""
+    if MSGSPEC_AVAILABLE:
+        return _rpc_encoder.encode(RPCRequest("2.0", request_id, method, params))
+    
+    # Only the id and params vary, so splice them onto the method's template
+    message = _request_prefix(method) + b"%d" % request_id
+    if params is not None:
+        message += b',"params":' + orjson.dumps(params)
+    return message + b"}"
+
+
+def _decode_response(data: bytes) -> tuple:
+    """Parse a JSON-RPC response into (id, result, error)"""
+    if MSGSPEC_AVAILABLE:
+        response = _rpc_decoder.decode(data)
+        return response.id, response.result, response.error
+    
+    response = orjson.loads(data)
+    return response.get("id"), response.get("result"), response.get("error")
+
+
+# Tool name keywords per category, in priority order
+_CATEGORY_KEYWORDS = (
+    ("Web Automation", ("browser", "navigate", "screenshot", "click", "fill")),
+    ("Math & Logic", ("calculator", "random", "temperature")),
+    ("Obsidian", ("obsidian",)),
+    ("Filesystem", ("file", "directory", "search_files")),
+    ("System", ("execute_command",)),
+    ("Utilities", ("time", "word_count")),
+)
+_KEYWORD_CATEGORIES = {
+    keyword: (priority, category)
+    for priority, (category, keywords) in enumerate(_CATEGORY_KEYWORDS)
+    for keyword in keywords
+}
+# One alternation scans a name once instead of one substring test per keyword
+_KEYWORD_PATTERN = re.compile("|".join(
+    re.escape(keyword) for keyword in sorted(_KEYWORD_CATEGORIES, key=len, reverse=True)
+))
+
 @dataclass
 class MCPTool:
     """Represents an MCP tool with structured schema"""
@@ -23,24 +128,36 @@ class MCPTool:
 class MCPClient:
     """Client for communicating with FastMCP server"""
     
-    def __init__(self, server_command: List[str]):
+    def __init__(self, server_command: List[str], tools_cache_path: Optional[str] = None):
         self.server_command = server_command
-        self.process: Optional[subprocess.Popen] = None
+        # Where the tools/list result is kept between runs, if anywhere
+        self.tools_cache_path = tools_cache_path
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.tools: Dict[str, MCPTool] = {}
+        # Bumped whenever the tool list is reloaded, so adapters can rebuild
+        self.tools_version = 0
         self._initialized = False
+        # In-flight requests by JSON-RPC id, resolved by the reader task
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._reader_task: Optional[asyncio.Task] = None
+        # The pipes and reader task belong to the loop that connected
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
     
     async def connect(self) -> bool:
         """Connect to the MCP server"""
         try:
+            self._loop = asyncio.get_running_loop()
+            
             # Start the MCP server process
-            self.process = subprocess.Popen(
-                self.server_command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=0
+            self.process = await asyncio.create_subprocess_exec(
+                *self.server_command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=2**20
             )
+            self._reader_task = asyncio.create_task(self._reader_loop())
             
             # Initialize MCP protocol
             await self._initialize_protocol()
@@ -52,60 +169,46 @@ class MCPClient:
             
         except Exception as e:
             logger.error(f"Failed to connect to MCP server: {e}")
-            if self.process:
-                self.process.terminate()
-                self.process = None
+            if self._reader_task:
+                self._reader_task.cancel()
+                self._reader_task = None
+            await self._stop_process()
             return False
     
     async def _initialize_protocol(self):
         """Initialize MCP protocol handshake"""
         # Send initialize request
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {}
-                },
-                "clientInfo": {
-                    "name": "universal-ai-chat",
-                    "version": "1.0.0"
-                }
+        init_params = {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {
+                "tools": {}
+            },
+            "clientInfo": {
+                "name": "universal-ai-chat",
+                "version": "1.0.0"
             }
         }
         
-        await self._send_request(init_request)
-        response = await self._read_response()
+        _, error = await self._request("initialize", init_params)
         
-        if response.get("error"):
-            raise Exception(f"MCP initialization failed: {response['error']}")
+        if error:
+            raise Exception(f"MCP initialization failed: {error}")
         
         # Send initialized notification
-        initialized_notification = {
-            "jsonrpc": "2.0",
-            "method": "notifications/initialized"
-        }
-        
-        await self._send_request(initialized_notification)
+        await self._send(_INITIALIZED_NOTIFICATION)
     
     async def _list_tools(self):
         """List available tools from the MCP server"""
-        list_tools_request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "tools/list"
-        }
-        
-        await self._send_request(list_tools_request)
-        response = await self._read_response()
-        
-        if response.get("error"):
-            raise Exception(f"Failed to list tools: {response['error']}")
-        
-        # Parse tools from response
-        tools_data = response.get("result", {}).get("tools", [])
+        tools_data = self._load_cached_tools()
+        if tools_data is None:
+            result, error = await self._request("tools/list")
+            
+            if error:
+                raise Exception(f"Failed to list tools: {error}")
+            
+            # Parse tools from response
+            tools_data = (result or {}).get("tools", [])
+            self._save_cached_tools(tools_data)
         
         for tool_data in tools_data:
             tool = MCPTool(
@@ -115,23 +218,38 @@ class MCPClient:
                 category=self._categorize_tool(tool_data["name"])
             )
             self.tools[tool.name] = tool
+        
+        self.tools_version += 1
+    
+    def _load_cached_tools(self) -> Optional[List[Dict[str, Any]]]:
+        """Read the tool list saved by an earlier run, if there is a usable one"""
+        if not self.tools_cache_path:
+            return None
+        try:
+            with open(self.tools_cache_path, "rb") as f:
+                tools_data = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        return tools_data if isinstance(tools_data, list) else None
+    
+    def _save_cached_tools(self, tools_data: List[Dict[str, Any]]):
+        """Save the tool list for later runs; a failed write only costs the next run a fetch"""
+        if not self.tools_cache_path:
+            return
+        # Write to a temporary file and rename, so readers never see a partial file
+        temp_path = f"{self.tools_cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.tools_cache_path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(orjson.dumps(tools_data))
+            os.replace(temp_path, self.tools_cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache MCP tool list: {e}")
     
     def _categorize_tool(self, tool_name: str) -> str:
         """Categorize tool based on its name"""
-        if any(word in tool_name for word in ['browser', 'navigate', 'screenshot', 'click', 'fill']):
-            return "Web Automation"
-        elif any(word in tool_name for word in ['calculator', 'random', 'temperature']):
-            return "Math & Logic"
-        elif any(word in tool_name for word in ['obsidian']):
-            return "Obsidian"
-        elif any(word in tool_name for word in ['file', 'directory', 'search_files']):
-            return "Filesystem"
-        elif any(word in tool_name for word in ['execute_command']):
-            return "System"
-        elif any(word in tool_name for word in ['time', 'word_count']):
-            return "Utilities"
-        else:
-            return "General"
+        matches = [_KEYWORD_CATEGORIES[m.group()] for m in _KEYWORD_PATTERN.finditer(tool_name)]
+        return min(matches)[1] if matches else "General"
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call a tool via MCP protocol"""
@@ -141,52 +259,88 @@ class MCPClient:
         if tool_name not in self.tools:
             raise Exception(f"Tool '{tool_name}' not found")
         
-        # Prepare tool call request
-        tool_call_request = {
-            "jsonrpc": "2.0",
-            "id": 3,
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-        
-        await self._send_request(tool_call_request)
-        response = await self._read_response()
+        result, error = await self._request("tools/call", {
+            "name": tool_name,
+            "arguments": arguments
+        })
         
-        if response.get("error"):
-            raise Exception(f"Tool call failed: {response['error']}")
+        if error:
+            raise Exception(f"Tool call failed: {error}")
         
-        return response.get("result", {})
+        return result if result is not None else {}
     
-    async def _send_request(self, request: Dict[str, Any]):
-        """Send JSON-RPC request to MCP server"""
-        if not self.process or not self.process.stdin:
+    async def _request(self, method: str, params: Optional[Dict[str, Any]] = None) -> tuple:
+        """Send a JSON-RPC request and wait for its (result, error) pair"""
+        if self._reader_task is None or self._reader_task.done():
             raise Exception("MCP server process not available")
+        if asyncio.get_running_loop() is not self._loop:
+            raise Exception("MCP client used from a different event loop than the one it connected on")
         
-        request_json = json.dumps(request) + "\n"
-        self.process.stdin.write(request_json)
-        self.process.stdin.flush()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
         
-        logger.debug(f"Sent MCP request: {request}")
+        try:
+            await self._send(_encode_request(request_id, method, params))
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
     
-    async def _read_response(self) -> Dict[str, Any]:
-        """Read JSON-RPC response from MCP server"""
-        if not self.process or not self.process.stdout:
+    async def _send(self, message: bytes):
+        """Send a serialized JSON-RPC message to MCP server"""
+        if not self.process or not self.process.stdin:
             raise Exception("MCP server process not available")
         
-        # Read line from stdout
-        line = self.process.stdout.readline()
-        if not line:
-            raise Exception("No response from MCP server")
+        self.process.stdin.write(message + b"\n")
+        await self.process.stdin.drain()
         
+        logger.debug("Sent MCP request: %s", message)
+    
+    async def _read_message(self) -> bytes:
+        """Read one newline-delimited message, however long it is"""
+        stdout = self.process.stdout
+        parts = []
+        while True:
+            try:
+                parts.append(await stdout.readuntil(b"\n"))
+                break
+            except asyncio.LimitOverrunError as e:
+                # Larger than the stream buffer (e.g. a base64 screenshot): take
+                # what is buffered in one read and keep looking for the newline
+                parts.append(await stdout.readexactly(e.consumed))
+            except asyncio.IncompleteReadError as e:
+                parts.append(e.partial)
+                break
+        return b"".join(parts)
+    
+    async def _reader_loop(self):
+        """Read JSON-RPC responses and hand each to the request waiting on its id"""
+        # Also used when disconnect() cancels the reader, which skips except Exception
+        failure = ConnectionError("MCP server disconnected")
         try:
-            response = json.loads(line.strip())
-            logger.debug(f"Received MCP response: {response}")
-            return response
-        except json.JSONDecodeError as e:
-            raise Exception(f"Invalid JSON response: {e}")
+            while True:
+                line = await self._read_message()
+                if not line:
+                    break
+                
+                try:
+                    response_id, result, error = _decode_response(line)
+                except _RPC_DECODE_ERRORS as e:
+                    logger.warning(f"Invalid JSON response: {e}")
+                    continue
+                logger.debug("Received MCP response: %s", line)
+                
+                future = self._pending.pop(response_id, None)
+                if future is not None and not future.done():
+                    future.set_result((result, error))
+        except Exception as e:
+            failure = ConnectionError(f"MCP reader failed: {e}")
+        finally:
+            # The pipe is gone, so nothing else will answer the waiting requests
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(failure)
+            self._pending.clear()
     
     def get_available_tools(self) -> List[Dict[str, Any]]:
         """Get list of available tools in API format"""
@@ -202,24 +356,49 @@ class MCPClient:
         
         return tools
     
-    def disconnect(self):
+    async def disconnect(self):
         """Disconnect from MCP server"""
-        if self.process:
-            self.process.terminate()
-            self.process.wait(timeout=5)
-            self.process = None
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+        await self._stop_process()
         
         self._initialized = False
         logger.info("Disconnected from MCP server")
+    
+    async def _stop_process(self):
+        """Terminate and reap the server process, killing it if it ignores SIGTERM"""
+        if not self.process:
+            return
+        
+        if self.process.returncode is None:
+            self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            # Ignored SIGTERM; kill and reap it so no zombie is left behind
+            logger.warning("MCP server did not exit after SIGTERM, killing it")
+            self.process.kill()
+            await self.process.wait()
+        self.process = None
 
 class MCPToolAdapter:
     """Adapter to integrate MCP tools with existing agent framework"""
     
     def __init__(self, mcp_client: MCPClient):
         self.mcp_client = mcp_client
+        
+        # Built once per MCPClient.tools_version
+        self._functions: Optional[Dict[str, callable]] = None
+        self._functions_version = -1
+        self._schemas: Optional[Dict[str, Dict[str, Any]]] = None
+        self._schemas_version = -1
     
     def get_tool_functions(self) -> Dict[str, callable]:
         """Get tool functions compatible with existing agent framework"""
+        if self._functions_version == self.mcp_client.tools_version:
+            return self._functions
+        
         functions = {}
         
         for tool_name in self.mcp_client.tools:
@@ -240,10 +419,15 @@ class MCPToolAdapter:
             
             functions[tool_name] = make_tool_function(tool_name)
         
+        self._functions = functions
+        self._functions_version = self.mcp_client.tools_version
         return functions
     
     def get_tool_schemas(self) -> Dict[str, Dict[str, Any]]:
         """Get tool schemas compatible with OpenAI function calling format"""
+        if self._schemas_version == self.mcp_client.tools_version:
+            return self._schemas
+        
         schemas = {}
         
         for tool_name, tool in self.mcp_client.tools.items():
@@ -259,12 +443,21 @@ class MCPToolAdapter:
             
             schemas[tool_name] = openai_schema
         
+        self._schemas = schemas
+        self._schemas_version = self.mcp_client.tools_version
         return schemas
 
 # Convenience function to create and connect MCP client
-async def create_mcp_client(server_path: str = "../mcp-server/server.py") -> MCPClient:
-    """Create and connect to MCP server"""
-    import os
+async def create_mcp_client(server_path: str = "../mcp-server/server.py",
+                            cache_tools: bool = False) -> MCPClient:
+    """
+    Create and connect to MCP server
+    
+    With cache_tools, the tool list is read from a cache file written by an
+    earlier run against the same, unmodified server sources instead of being
+    fetched from the server. Only enable it for servers whose tools don't
+    depend on anything else, such as environment variables or config files.
+    """
     import sys
     
     # Get the absolute path to the server
@@ -273,7 +466,8 @@ async def create_mcp_client(server_path: str = "../mcp-server/server.py") -> MCP
     # Command to run the MCP server
     server_command = [sys.executable, server_full_path]
     
-    client = MCPClient(server_command)
+    tools_cache_path = _tools_cache_path(server_full_path) if cache_tools else None
+    client = MCPClient(server_command, tools_cache_path)
     
     if await client.connect():
         return client
@@ -303,7 +497,7 @@ async def main():
             print(f"Current time: {result}")
         
         # Disconnect
-        client.disconnect()
+        await client.disconnect()
         
     except Exception as e:
         print(f"Error: {e}")
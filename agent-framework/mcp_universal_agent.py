@@ -4,10 +4,13 @@ Integrates structured tool communication via FastMCP server
 """
 
 import asyncio
+import functools
 import logging
+import orjson
+import time
 import traceback
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
@@ -16,16 +19,15 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai-providers'))
 
-from ai_interface import AIProvider, ProviderFactory, Message, MessageRole, AIResponse
-
-# Import providers to register them
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai-providers'))
-import openai_provider
-import gemini_provider
+from ai_interface import AIProvider, ProviderFactory, Message, MessageRole, AIResponse, ToolDefinition
 from mcp_client import MCPClient, MCPToolAdapter, create_mcp_client
 
 logger = logging.getLogger(__name__)
 
+# Tools in these categories share state (browser session, files, shell),
+# so calls to them run one at a time in the order the model made them
+_STATEFUL_TOOL_CATEGORIES = frozenset({"Web Automation", "Filesystem", "System", "Obsidian"})
+
 class ThinkingStepType(Enum):
     """Types of thinking steps"""
     USER_INPUT = "user_input"
@@ -35,30 +37,69 @@ class ThinkingStepType(Enum):
     REASONING = "reasoning"
     FINAL_RESPONSE = "final_response"
 
-@dataclass
+@dataclass(slots=True)
 class ThinkingStep:
     """A step in the AI's thinking process"""
     type: ThinkingStepType
     title: str
     content: str
-    timestamp: str
+    timestamp_ns: int  # Wall-clock nanoseconds since the epoch
     duration_ms: Optional[int] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO-format wall-clock time, formatted only when asked for"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9).isoformat()
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Structured result from tool execution"""
     success: bool
-    content: Any
+    content: str  # Passed to the provider as the tool message as-is
     tool_name: str
     structured_data: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
+    duration_ms: Optional[int] = None
+
+@dataclass(slots=True)
+class _ChatContext:
+    """Per-call thinking state, so concurrent chats on one agent never share it"""
+    steps: List[ThinkingStep] = field(default_factory=list)
+    # Called with each step as it is added
+    on_step: Optional[Callable[[ThinkingStep], None]] = None
+    # (wall-clock ns, perf_counter ns) read together when the chat starts, so
+    # step times come from the cheap monotonic counter
+    clock_anchor: tuple = field(default_factory=lambda: (time.time_ns(), time.perf_counter_ns()))
+
+def _step_to_dict(step: ThinkingStep) -> Dict[str, Any]:
+    """Convert a thinking step to dictionary format for JSON serialization"""
+    return {
+        "type": step.type.value,
+        "title": step.title,
+        "content": step.content,
+        "timestamp": step.timestamp,
+        "duration_ms": step.duration_ms,
+        "metadata": step.metadata
+    }
+
+def _first_text(mcp_result: Dict[str, Any]) -> Optional[str]:
+    """Text of an MCP result's first content block, or None if it has none"""
+    content = mcp_result.get('content')
+    return content[0].get('text') if content else None
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback: thinking steps in their dictionary format, anything else as a string"""
+    if isinstance(obj, ThinkingStep):
+        return _step_to_dict(obj)
+    return str(obj)
 
 class MCPUniversalAgent:
     """Enhanced Universal Agent with MCP protocol support"""
     
     def __init__(self, provider: str = 'openai', model_name: str = 'gpt-4o-mini', 
-                 system_prompt: str = None, mcp_server_path: str = "../mcp-server/server.py"):
+                 system_prompt: str = None, mcp_server_path: str = "../mcp-server/server.py",
+                 max_history_messages: Optional[int] = 40, cache_mcp_tools: bool = False):
         """
         Initialize the Enhanced Universal Agent with MCP support
         
@@ -67,40 +108,80 @@ class MCPUniversalAgent:
             model_name: Model to use
             system_prompt: System prompt for the agent
             mcp_server_path: Path to the MCP server script
+            max_history_messages: Conversation messages kept for the provider, not
+                counting the system message; older turns are dropped (None keeps all)
+            cache_mcp_tools: Reuse the MCP tool list saved by an earlier run against
+                the same server sources (see create_mcp_client)
         """
         self.provider_name = provider
         self.model_name = model_name
         self.system_prompt = system_prompt or self._get_default_system_prompt()
         self.mcp_server_path = mcp_server_path
+        self.max_history_messages = max_history_messages
+        self.cache_mcp_tools = cache_mcp_tools
         
         # Initialize AI provider
         self.provider: Optional[AIProvider] = None
         self.mcp_client: Optional[MCPClient] = None
         self.mcp_adapter: Optional[MCPToolAdapter] = None
+        # Whether the provider accepts tool definitions; set with the provider
+        self._provider_supports_tools = False
+        
+        # OpenAI-format tool schemas and their joined names, listed once per MCP connection
+        self._cached_tool_schemas: List[Dict[str, Any]] = []
+        self._cached_tool_names_joined = ""
         
-        # Conversation history
-        self.conversation_history: List[Message] = []
+        # Messages sent to the provider: the system message followed by the
+        # conversation, appended to as the conversation grows
+        self._system_message = Message(role=MessageRole.SYSTEM, content=self.system_prompt)
+        self._messages: List[Message] = [self._system_message]
         
         # Tool execution results for context
         self.recent_tool_results: List[ToolResult] = []
         
-        # Thinking process tracking
+        # Thinking steps of the most recently started chat; each chat records
+        # its own steps in a _ChatContext
         self.thinking_steps: List[ThinkingStep] = []
         
+        # Converted tool definitions keyed by id() of their MCP schema; the
+        # schema is kept alongside so its id can't be reused while cached
+        self._tool_def_cache: Dict[int, tuple] = {}
+        # Schema ids and provider the current tool definitions were added to
+        self._last_tool_ids: frozenset = frozenset()
+        self._tools_provider: Optional[AIProvider] = None
+        
         self._initialized = False
     
     async def initialize(self) -> bool:
         """Initialize both AI provider and MCP client"""
+        self._cached_tool_schemas = []
+        self._cached_tool_names_joined = ""
         try:
-            # Initialize AI provider
-            self.provider = ProviderFactory.create_provider(
-                self.provider_name, 
-                self.model_name
+            # Independent, so start the MCP server while the provider (and its
+            # module, on first use) loads in a worker thread
+            provider, mcp_client = await asyncio.gather(
+                asyncio.to_thread(ProviderFactory.create_provider, self.provider_name, self.model_name),
+                create_mcp_client(self.mcp_server_path, self.cache_mcp_tools),
+                return_exceptions=True
             )
+            if isinstance(provider, Exception):
+                # Don't leave the server process running without an agent
+                if not isinstance(mcp_client, Exception):
+                    await mcp_client.disconnect()
+                raise provider
+            if isinstance(mcp_client, Exception):
+                # Release the provider's resources, since no agent will own it
+                await provider.aclose()
+                raise mcp_client
             
-            # Initialize MCP client
-            self.mcp_client = await create_mcp_client(self.mcp_server_path)
+            self.provider = provider
+            self._provider_supports_tools = self._supports_tools(self.provider)
+            self.mcp_client = mcp_client
             self.mcp_adapter = MCPToolAdapter(self.mcp_client)
+            self._cached_tool_schemas = list(self.mcp_adapter.get_tool_schemas().values())
+            self._cached_tool_names_joined = ", ".join(
+                tool.get('function', {}).get('name', 'unknown') for tool in self._cached_tool_schemas
+            )
             
             self._initialized = True
             
@@ -111,19 +192,23 @@ class MCPUniversalAgent:
             logger.error(f"Failed to initialize Enhanced Universal Agent: {e}")
             return False
     
-    def _add_thinking_step(self, step_type: ThinkingStepType, title: str, content: str, 
-                          duration_ms: Optional[int] = None, metadata: Optional[Dict[str, Any]] = None):
-        """Add a step to the thinking process"""
+    def _add_thinking_step(self, context: _ChatContext, step_type: ThinkingStepType, title: str,
+                          content: str, duration_ms: Optional[int] = None,
+                          metadata: Optional[Dict[str, Any]] = None):
+        """Add a step to a chat's thinking process"""
+        wall_ns, perf_ns = context.clock_anchor
         step = ThinkingStep(
             type=step_type,
             title=title,
             content=content,
-            timestamp=datetime.now().isoformat(),
+            timestamp_ns=wall_ns + time.perf_counter_ns() - perf_ns,
             duration_ms=duration_ms,
             metadata=metadata or {}
         )
-        self.thinking_steps.append(step)
-        logger.info(f"Thinking step: {title}")
+        context.steps.append(step)
+        logger.debug("Thinking step: %s", title)
+        if context.on_step is not None:
+            context.on_step(step)
 
     def _get_default_system_prompt(self) -> str:
         """Get default system prompt with MCP tool awareness"""
@@ -145,7 +230,9 @@ When using tools:
 Be helpful, accurate, and make full use of the available tools to provide the best possible assistance."""
     
     async def chat(self, user_input: str, temperature: float = 0.7, 
-                  max_tokens: int = 1000, use_tools: bool = True) -> str:
+                  max_tokens: int = 1000, use_tools: bool = True,
+                  on_delta: Optional[Callable[[str], None]] = None,
+                  on_step: Optional[Callable[[ThinkingStep], None]] = None) -> str:
         """
         Enhanced chat method with MCP tool integration
         
@@ -154,15 +241,24 @@ Be helpful, accurate, and make full use of the available tools to provide the be
             temperature: Response randomness (0.0-1.0)
             max_tokens: Maximum tokens in response
             use_tools: Whether to use MCP tools
+            on_delta: Called with each chunk of generated text; streams provider calls when set
+            on_step: Called with each thinking step as it is added
             
         Returns:
             AI response as string
         """
-        # Clear previous thinking steps for new conversation
-        self.thinking_steps.clear()
+        return await self._chat(_ChatContext(on_step=on_step), user_input, temperature,
+                                max_tokens, use_tools, on_delta)
+    
+    async def _chat(self, context: _ChatContext, user_input: str, temperature: float,
+                    max_tokens: int, use_tools: bool,
+                    on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """chat(), recording thinking steps in context"""
+        self.thinking_steps = context.steps
         
         # Track user input
         self._add_thinking_step(
+            context,
             ThinkingStepType.USER_INPUT,
             "Processing user request",
             user_input,
@@ -177,44 +273,44 @@ Be helpful, accurate, and make full use of the available tools to provide the be
             role=MessageRole.USER,
             content=user_input
         )
-        self.conversation_history.append(user_message)
+        self._messages.append(user_message)
+        self._trim_history()
         
         try:
             # Prepare messages for AI provider
             messages = self._prepare_messages_for_provider()
             
             # Get available tools if enabled
-            tools = []
-            if use_tools and self.mcp_adapter:
-                tool_schemas = self.mcp_adapter.get_tool_schemas()
-                tools = list(tool_schemas.values())
-                
+            tools = self._cached_tool_schemas if use_tools and self.mcp_adapter else []
+            if tools:
                 # Track tool planning
                 self._add_thinking_step(
+                    context,
                     ThinkingStepType.TOOL_PLANNING,
                     f"Planning with {len(tools)} available tools",
-                    f"Available tools: {', '.join([tool.get('function', {}).get('name', 'unknown') for tool in tools])}",
+                    f"Available tools: {self._cached_tool_names_joined}",
                     metadata={"tool_count": len(tools)}
                 )
             
             # Track reasoning step
-            start_time = datetime.now()
+            start_ns = time.perf_counter_ns()
             self._add_thinking_step(
+                context,
                 ThinkingStepType.REASONING,
                 "Generating initial response",
                 f"Calling {self.provider_name} with model {self.model_name}"
             )
             
             # Call AI provider
-            response = await self._call_provider_with_tools(messages, tools, temperature, max_tokens)
+            response = await self._call_provider_with_tools(messages, tools, temperature, max_tokens, on_delta)
             
             # Process response and handle tool calls
-            final_response = await self._process_response(response, use_tools)
+            final_response = await self._process_response(context, response, use_tools, on_delta)
             
             # Track final response
-            end_time = datetime.now()
-            duration = int((end_time - start_time).total_seconds() * 1000)
+            duration = (time.perf_counter_ns() - start_ns) // 1_000_000
             self._add_thinking_step(
+                context,
                 ThinkingStepType.FINAL_RESPONSE,
                 "Response completed",
                 f"Generated {len(final_response)} characters",
@@ -227,7 +323,7 @@ Be helpful, accurate, and make full use of the available tools to provide the be
                 role=MessageRole.ASSISTANT,
                 content=final_response
             )
-            self.conversation_history.append(assistant_message)
+            self._messages.append(assistant_message)
             
             return final_response
             
@@ -236,80 +332,153 @@ Be helpful, accurate, and make full use of the available tools to provide the be
             logger.error(error_msg)
             return error_msg
     
+    @property
+    def conversation_history(self) -> List[Message]:
+        """Messages of the conversation so far, without the system message"""
+        return self._messages[1:]
+    
+    def _trim_history(self):
+        """Drop the oldest whole turns once the conversation exceeds max_history_messages"""
+        if self.max_history_messages is None:
+            return
+        
+        excess = len(self._messages) - 1 - self.max_history_messages
+        if excess <= 0:
+            return
+        
+        # Cut at a user message so tool calls are never split from their results
+        for cut in range(1 + excess, len(self._messages)):
+            if self._messages[cut].role == MessageRole.USER:
+                del self._messages[1:cut]
+                return
+    
     def _prepare_messages_for_provider(self) -> List[Message]:
-        """Prepare messages including system prompt and tool context"""
-        messages = []
-        
-        # Add system message with tool context
-        enhanced_system_prompt = self.system_prompt
-        
-        if self.recent_tool_results:
-            tool_context = "\n\nRecent tool execution results for context:"
-            for result in self.recent_tool_results[-3:]:  # Last 3 results
-                if result.success:
-                    tool_context += f"\n- {result.tool_name}: {result.content}"
-        
-        system_message = Message(
-            role=MessageRole.SYSTEM,
-            content=enhanced_system_prompt
-        )
-        messages.append(system_message)
+        """
+        Get the messages to send to the provider, system prompt first.
         
-        # Add conversation history
-        messages.extend(self.conversation_history)
+        This is the agent's own list rather than a copy, so callers must
+        not modify it.
+        """
+        # Rebuild the system message only if the prompt has been replaced
+        if self._system_message.content is not self.system_prompt:
+            self._system_message = Message(role=MessageRole.SYSTEM, content=self.system_prompt)
+            self._messages[0] = self._system_message
         
-        return messages
+        return self._messages
     
     async def _call_provider_with_tools(self, messages: List[Message], tools: List[Dict], 
-                                       temperature: float, max_tokens: int) -> AIResponse:
+                                       temperature: float, max_tokens: int,
+                                       on_delta: Optional[Callable[[str], None]] = None) -> AIResponse:
         """Call AI provider with tool support"""
-        logger.info(f"Calling provider with {len(tools)} tools available")
+        logger.info("Calling provider with %d tools available", len(tools))
         
         # Add tools to provider if available
-        if tools and hasattr(self.provider, 'clear_tools') and hasattr(self.provider, 'add_tool'):
-            # Clear existing tools and add new ones
-            self.provider.clear_tools()
-            
-            for tool_schema in tools:
-                tool_name = tool_schema.get('function', {}).get('name', 'unknown')
-                logger.info(f"Adding tool: {tool_name}")
-                
-                # Convert MCP tool schema to provider format and create MCP wrapper function
-                if 'function' in tool_schema:
-                    from ai_interface import ToolDefinition
-                    
-                    # Create a wrapper function that calls MCP
-                    def make_mcp_tool_function(name: str):
-                        async def mcp_tool_function(**kwargs):
-                            logger.info(f"Executing MCP tool: {name} with args: {kwargs}")
-                            try:
-                                result = await self.mcp_client.call_tool(name, kwargs)
-                                logger.info(f"MCP tool {name} result: {result}")
-                                return result
-                            except Exception as e:
-                                logger.error(f"MCP tool {name} error: {e}")
-                                return {"error": str(e), "success": False}
-                        return mcp_tool_function
-                    
-                    tool_def = ToolDefinition(
-                        name=tool_schema['function']['name'],
-                        description=tool_schema['function']['description'],
-                        parameters=tool_schema['function']['parameters'],
-                        function=make_mcp_tool_function(tool_name)
-                    )
-                    self.provider.add_tool(tool_def)
+        if tools and self._provider_supports_tools:
+            self._register_tools(tools)
         
         # Call provider with tools
-        response = self.provider.chat(
+        if on_delta is not None:
+            response = await asyncio.to_thread(
+                self._collect_stream, messages, temperature, max_tokens, on_delta
+            )
+        else:
+            # Async so the event loop keeps serving other requests meanwhile
+            response = await self.provider.achat(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Provider response: content_length=%d, tool_calls=%d",
+                        len(response.content or ''), len(response.tool_calls) if response.tool_calls else 0)
+        return response
+    
+    @staticmethod
+    def _supports_tools(provider: AIProvider) -> bool:
+        """Whether tool definitions can be added to a provider"""
+        return hasattr(provider, 'clear_tools') and hasattr(provider, 'add_tool')
+    
+    def _register_tools(self, tools: List[Dict]):
+        """Give the provider a ToolDefinition per MCP schema, unless it already has this set"""
+        tool_ids = frozenset(map(id, tools))
+        if tool_ids == self._last_tool_ids and self.provider is self._tools_provider:
+            return
+        
+        # Clear existing tools and add new ones
+        self.provider.clear_tools()
+        
+        # Rebuilt from the current schemas so entries for replaced ones are dropped
+        cache = {}
+        for tool_schema in tools:
+            # Convert MCP tool schema to provider format and create MCP wrapper function
+            if 'function' not in tool_schema:
+                continue
+            
+            cached = self._tool_def_cache.get(id(tool_schema))
+            if cached is None:
+                logger.info("Adding tool: %s", tool_schema['function']['name'])
+                cached = (tool_schema, self._make_tool_definition(tool_schema))
+            cache[id(tool_schema)] = cached
+            self.provider.add_tool(cached[1])
+        
+        self._tool_def_cache = cache
+        self._last_tool_ids = tool_ids
+        self._tools_provider = self.provider
+    
+    def _make_tool_definition(self, tool_schema: Dict[str, Any]) -> ToolDefinition:
+        """Build a ToolDefinition whose function calls the MCP tool"""
+        function = tool_schema['function']
+        return ToolDefinition(
+            name=function['name'],
+            description=function['description'],
+            parameters=function['parameters'],
+            # One shared method bound to the tool name rather than a closure per tool
+            function=functools.partial(self._invoke_mcp_tool, function['name']),
+            parallel_safe=self._is_parallel_safe(function['name'])
+        )
+    
+    async def _invoke_mcp_tool(self, name: str, **kwargs) -> Any:
+        """Call an MCP tool on behalf of the provider's tool execution"""
+        logger.info("Executing MCP tool: %s with args: %s", name, kwargs)
+        try:
+            result = await self.mcp_client.call_tool(name, kwargs)
+            logger.info("MCP tool %s result: %s", name, result)
+            return result
+        except Exception as e:
+            logger.error(f"MCP tool {name} error: {e}")
+            return {"error": str(e), "success": False}
+    
+    def _is_parallel_safe(self, tool_name: str) -> bool:
+        """Whether a tool can run concurrently with other tool calls"""
+        tool = self.mcp_client.tools.get(tool_name) if self.mcp_client else None
+        return tool is None or tool.category not in _STATEFUL_TOOL_CATEGORIES
+    
+    def _collect_stream(self, messages: List[Message], temperature: float, max_tokens: int,
+                        on_delta: Callable[[str], None]) -> AIResponse:
+        """Stream a provider call, passing text chunks to on_delta, and assemble the full response"""
+        parts = []
+        last_chunk = None
+        for chunk in self.provider.chat_stream(
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens
+        ):
+            if chunk.content:
+                parts.append(chunk.content)
+                on_delta(chunk.content)
+            last_chunk = chunk
+        
+        # Tool calls, finish_reason and usage arrive on the final chunk
+        return AIResponse(
+            content="".join(parts),
+            tool_calls=last_chunk.tool_calls if last_chunk else None,
+            finish_reason=last_chunk.finish_reason if last_chunk else None,
+            usage=last_chunk.usage if last_chunk else None
         )
-        
-        logger.info(f"Provider response: content_length={len(response.content or '')}, tool_calls={len(response.tool_calls) if response.tool_calls else 0}")
-        return response
     
-    async def _process_response(self, response: AIResponse, use_tools: bool) -> str:
+    async def _process_response(self, context: _ChatContext, response: AIResponse, use_tools: bool,
+                                on_delta: Optional[Callable[[str], None]] = None) -> str:
         """Process AI response and handle tool calls with proper OpenAI flow"""
         
         # If no tool calls, return content directly
@@ -317,7 +486,7 @@ Be helpful, accurate, and make full use of the available tools to provide the be
             return response.content or ""
         
         # Handle tool calls with proper OpenAI conversation flow
-        logger.info(f"Processing {len(response.tool_calls)} tool calls")
+        logger.info("Processing %d tool calls", len(response.tool_calls))
         
         # Add the assistant's response with tool calls to conversation
         assistant_message = Message(
@@ -325,111 +494,208 @@ Be helpful, accurate, and make full use of the available tools to provide the be
             content=response.content or "",
             tool_calls=response.tool_calls
         )
-        self.conversation_history.append(assistant_message)
+        self._messages.append(assistant_message)
         
-        # Execute each tool call and add results to conversation
+        # Track every tool execution, then run them together
         for tool_call in response.tool_calls:
-            try:
-                # Track tool execution
-                self._add_thinking_step(
-                    ThinkingStepType.TOOL_EXECUTION,
-                    f"Executing {tool_call.name}",
-                    f"Arguments: {tool_call.arguments}",
-                    metadata={"tool_name": tool_call.name, "arguments": tool_call.arguments}
-                )
-                
-                tool_start_time = datetime.now()
-                logger.info(f"Executing tool: {tool_call.name} with args: {tool_call.arguments}")
-                tool_result = await self._execute_tool_call(tool_call)
-                self.recent_tool_results.append(tool_result)
-                
-                # Track tool result
-                tool_end_time = datetime.now()
-                tool_duration = int((tool_end_time - tool_start_time).total_seconds() * 1000)
-                result_preview = tool_result.content[:200] + "..." if len(str(tool_result.content)) > 200 else str(tool_result.content)
-                
-                self._add_thinking_step(
-                    ThinkingStepType.TOOL_RESULT,
-                    f"Tool {tool_call.name} {'succeeded' if tool_result.success else 'failed'}",
-                    result_preview,
-                    duration_ms=tool_duration,
-                    metadata={
-                        "tool_name": tool_call.name,
-                        "success": tool_result.success,
-                        "result_length": len(str(tool_result.content))
-                    }
-                )
-                
-                # Log tool result
-                logger.info(f"Tool {tool_call.name} result: success={tool_result.success}, content_length={len(tool_result.content) if tool_result.content else 0}")
-                
-                # Add tool result message to conversation
-                tool_content = tool_result.content if tool_result.success else f"Error: {tool_result.error_message}"
-                tool_message = Message(
-                    role=MessageRole.TOOL,
-                    content=tool_content,
-                    tool_call_id=tool_call.id,
-                    name=tool_call.name
-                )
-                self.conversation_history.append(tool_message)
-                logger.info(f"Added tool message to conversation: {tool_content[:100]}...")
-                
-            except Exception as e:
-                logger.error(f"Error executing tool call: {e}")
-                logger.error(f"Tool call traceback: {traceback.format_exc()}")
+            self._add_thinking_step(
+                context,
+                ThinkingStepType.TOOL_EXECUTION,
+                f"Executing {tool_call.name}",
+                f"Arguments: {tool_call.arguments}",
+                metadata={"tool_name": tool_call.name, "arguments": tool_call.arguments}
+            )
+            logger.info("Executing tool: %s with args: %s", tool_call.name, tool_call.arguments)
+        
+        # Report each result as soon as it arrives, fast tools first
+        tool_results: List[Union[ToolResult, Exception]] = [None] * len(response.tool_calls)
+        async for i, tool_result in self._iter_tool_results(response.tool_calls):
+            tool_results[i] = tool_result
+            tool_call = response.tool_calls[i]
+            
+            if isinstance(tool_result, Exception):
+                logger.error(f"Error executing tool call: {tool_result}")
+                logger.error(f"Tool call traceback: {''.join(traceback.format_exception(tool_result))}")
+                continue
+            
+            # Track tool result; large payloads are measured once
+            content_length = len(tool_result.content)
+            result_preview = tool_result.content[:200] + "..." if content_length > 200 else tool_result.content
+            
+            self._add_thinking_step(
+                context,
+                ThinkingStepType.TOOL_RESULT,
+                f"Tool {tool_call.name} {'succeeded' if tool_result.success else 'failed'}",
+                result_preview,
+                duration_ms=tool_result.duration_ms,
+                metadata={
+                    "tool_name": tool_call.name,
+                    "success": tool_result.success,
+                    "result_length": content_length
+                }
+            )
+            
+            # Log tool result
+            logger.info("Tool %s result: success=%s, content_length=%d", tool_call.name, tool_result.success, content_length)
+        
+        # Add results to conversation in the order the model asked for them
+        append_message = self._messages.append
+        append_result = self.recent_tool_results.append
+        for tool_call, tool_result in zip(response.tool_calls, tool_results):
+            if isinstance(tool_result, Exception):
                 # Add error message to conversation
-                error_content = f"Tool execution error: {str(e)}"
+                error_content = f"Tool execution error: {str(tool_result)}"
                 error_message = Message(
                     role=MessageRole.TOOL,
                     content=error_content,
                     tool_call_id=tool_call.id,
                     name=tool_call.name
                 )
-                self.conversation_history.append(error_message)
-                logger.info(f"Added error message to conversation: {error_content}")
+                append_message(error_message)
+                logger.info("Added error message to conversation: %s", error_content)
+                continue
+            
+            append_result(tool_result)
+            
+            # Add tool result message to conversation
+            tool_content = tool_result.content if tool_result.success else f"Error: {tool_result.error_message}"
+            tool_message = Message(
+                role=MessageRole.TOOL,
+                content=tool_content,
+                tool_call_id=tool_call.id,
+                name=tool_call.name
+            )
+            append_message(tool_message)
+            logger.info("Added tool message to conversation: %.100s...", tool_content)
+        
+        # With every tool failed, a second round trip rarely improves on text
+        # the model already wrote alongside its tool calls
+        if response.content and not any(
+            isinstance(tool_result, ToolResult) and tool_result.success for tool_result in tool_results
+        ):
+            logger.info("No tool call succeeded; skipping the follow-up call")
+            return response.content
         
         # Get final response from model after tool execution
         logger.info("Getting final response from model after tool execution")
         messages = self._prepare_messages_for_provider()
         
-        # Get available tools for the follow-up call
-        tools = []
-        if use_tools and self.mcp_adapter:
-            tool_schemas = self.mcp_adapter.get_tool_schemas()
-            tools = list(tool_schemas.values())
-        
         # Make follow-up call to get final response (without tools to prevent infinite loop)
-        logger.info(f"Making follow-up call with {len(messages)} messages (no tools to prevent recursion)")
-        final_response = await self._call_provider_with_tools(messages, [], 0.7, 1000)
+        logger.info("Making follow-up call with %d messages (no tools to prevent recursion)", len(messages))
+        final_response = await self._call_provider_with_tools(messages, [], 0.7, 1000, on_delta)
         
-        logger.info(f"Final response: content_length={len(final_response.content or '')}, tool_calls={len(final_response.tool_calls) if final_response.tool_calls else 0}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Final response: content_length=%d, tool_calls=%d",
+                        len(final_response.content or ''), len(final_response.tool_calls) if final_response.tool_calls else 0)
         
         return final_response.content or ""
     
     async def chat_with_thinking(self, user_input: str, temperature: float = 0.7, 
-                                max_tokens: int = 1000, use_tools: bool = True) -> tuple[str, List[Dict[str, Any]]]:
+                                max_tokens: int = 1000, use_tools: bool = True,
+                                on_delta: Optional[Callable[[str], None]] = None,
+                                on_step: Optional[Callable[[ThinkingStep], None]] = None) -> tuple[str, List[Dict[str, Any]]]:
         """
         Enhanced chat method that returns both response and thinking steps
         
         Returns:
             Tuple of (response_content, thinking_steps_dict)
         """
-        response = await self.chat(user_input, temperature, max_tokens, use_tools)
+        context = _ChatContext(on_step=on_step)
+        response = await self._chat(context, user_input, temperature, max_tokens, use_tools, on_delta)
         
         # Convert thinking steps to dictionary format for JSON serialization
-        thinking_steps_dict = []
-        for step in self.thinking_steps:
-            thinking_steps_dict.append({
-                "type": step.type.value,
-                "title": step.title,
-                "content": step.content,
-                "timestamp": step.timestamp,
-                "duration_ms": step.duration_ms,
-                "metadata": step.metadata
-            })
+        thinking_steps_dict = [_step_to_dict(step) for step in context.steps]
         
         return response, thinking_steps_dict
     
+    async def chat_with_thinking_json(self, user_input: str, temperature: float = 0.7,
+                                     max_tokens: int = 1000, use_tools: bool = True,
+                                     extra: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Variant of chat_with_thinking for callers that only want JSON
+        
+        Args:
+            extra: Additional top-level fields for the JSON object
+        
+        Returns:
+            {"response": content, "thinking_steps": [...], **extra} encoded with orjson
+        """
+        context = _ChatContext()
+        response = await self._chat(context, user_input, temperature, max_tokens, use_tools)
+        
+        # Steps are encoded straight from the dataclasses, without building a list of dicts first
+        return orjson.dumps(
+            {"response": response, "thinking_steps": context.steps, **(extra or {})},
+            default=_json_default,
+            option=orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        
+    async def chat_with_thinking_stream(self, user_input: str, temperature: float = 0.7,
+                                        max_tokens: int = 1000, use_tools: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of chat_with_thinking
+        
+        Yields:
+            {"delta": text} for each generated chunk and {"step": {...}} for
+            each thinking step as it happens, then a final
+            {"response": content, "thinking_steps": [...]} event
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        
+        # Provider streams run in a worker thread; hop chunks back onto the loop
+        def on_delta(text: str):
+            loop.call_soon_threadsafe(events.put_nowait, {"delta": text})
+        
+        # Steps are added on the loop itself
+        def on_step(step: ThinkingStep):
+            events.put_nowait({"step": _step_to_dict(step)})
+        
+        task = asyncio.ensure_future(
+            self.chat_with_thinking(user_input, temperature, max_tokens, use_tools, on_delta, on_step)
+        )
+        # Queued after every delta, since those are scheduled before the task finishes
+        task.add_done_callback(lambda _: events.put_nowait(None))
+        
+        while (event := await events.get()) is not None:
+            yield event
+        
+        response, thinking_steps = await task
+        yield {"response": response, "thinking_steps": thinking_steps}
+    
+    async def _iter_tool_results(self, tool_calls: List) -> AsyncIterator[tuple]:
+        """
+        Execute tool calls concurrently and yield (index, result) as each finishes.
+        
+        Stateful tools run one at a time, in order, each starting once the
+        previous stateful call is done. A result is a ToolResult or the
+        exception raised.
+        """
+        async def run(i: int, previous: Optional[asyncio.Task]) -> tuple:
+            if previous is not None:
+                await asyncio.wait([previous])
+            try:
+                return i, await self._execute_tool_call(tool_calls[i])
+            except Exception as e:
+                return i, e
+        
+        tasks = []
+        previous = None
+        for i, tool_call in enumerate(tool_calls):
+            if self._is_parallel_safe(tool_call.name):
+                tasks.append(asyncio.create_task(run(i, None)))
+            else:
+                previous = asyncio.create_task(run(i, previous))
+                tasks.append(previous)
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Don't leave tools running if the caller stops early
+            for task in tasks:
+                task.cancel()
+    
     async def _execute_tool_call(self, tool_call) -> ToolResult:
         """Execute a tool call via MCP"""
         # Handle both ToolCall objects and dictionaries
@@ -440,32 +706,43 @@ Be helpful, accurate, and make full use of the available tools to provide the be
             tool_name = tool_call.get('name')
             arguments = tool_call.get('arguments', {})
         
+        start_ns = time.perf_counter_ns()
         try:
             # MCP tools expect arguments wrapped in an 'input' object
             mcp_arguments = {"input": arguments}
-            logger.info(f"Calling MCP tool {tool_name} with wrapped args: {mcp_arguments}")
+            logger.info("Calling MCP tool %s with wrapped args: %s", tool_name, mcp_arguments)
             
             # Execute via MCP client
             mcp_result = await self.mcp_client.call_tool(tool_name, mcp_arguments)
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             # Parse MCP result
+            text = _first_text(mcp_result)
             if mcp_result.get('isError', False):
                 return ToolResult(
                     success=False,
-                    content=mcp_result.get('content', [{}])[0].get('text', 'Unknown error'),
+                    content='Unknown error' if text is None else text,
                     tool_name=tool_name,
-                    error_message=mcp_result.get('content', [{}])[0].get('text', 'Tool execution failed')
+                    error_message='Tool execution failed' if text is None else text,
+                    duration_ms=duration_ms
                 )
             else:
                 # Extract content
-                content = mcp_result.get('content', [{}])[0].get('text', '')
+                content = text or ''
                 structured_data = mcp_result.get('structuredContent', {})
+                if structured_data:
+                    # Encoded once here rather than per provider, so the model sees both parts
+                    content = orjson.dumps(
+                        {"text": content, "structured": structured_data},
+                        default=str
+                    ).decode()
                 
                 return ToolResult(
                     success=True,
                     content=content,
                     tool_name=tool_name,
-                    structured_data=structured_data
+                    structured_data=structured_data,
+                    duration_ms=duration_ms
                 )
                 
         except Exception as e:
@@ -473,7 +750,8 @@ Be helpful, accurate, and make full use of the available tools to provide the be
                 success=False,
                 content=str(e),
                 tool_name=tool_name,
-                error_message=str(e)
+                error_message=str(e),
+                duration_ms=(time.perf_counter_ns() - start_ns) // 1_000_000
             )
     
     async def get_available_tools(self) -> List[Dict[str, Any]]:
@@ -486,30 +764,34 @@ Be helpful, accurate, and make full use of the available tools to provide the be
         else:
             return []
     
-    def switch_provider(self, provider: str, model_name: str = None):
-        """Switch AI provider"""
+    async def switch_provider(self, provider: str, model_name: str = None):
+        """Switch AI provider, closing the one it replaces"""
         self.provider_name = provider
         if model_name:
             self.model_name = model_name
         
-        # Reinitialize provider
-        self.provider = ProviderFactory.create_provider(
+        # Tools are re-added on the next chat() since the provider changed
+        new_provider = ProviderFactory.create_provider(
             self.provider_name, 
             self.model_name
         )
+        if self.provider is not None:
+            await self.provider.aclose()
+        self.provider = new_provider
+        self._provider_supports_tools = self._supports_tools(self.provider)
         
         logger.info(f"Switched to provider: {provider}/{self.model_name}")
     
     def clear_conversation(self):
         """Clear conversation history and recent tool results"""
-        self.conversation_history.clear()
+        del self._messages[1:]
         self.recent_tool_results.clear()
         logger.info("Conversation history cleared")
     
     def get_conversation_summary(self) -> Dict[str, Any]:
         """Get summary of current conversation"""
         return {
-            "message_count": len(self.conversation_history),
+            "message_count": len(self._messages) - 1,
             "tool_results": len(self.recent_tool_results),
             "provider": f"{self.provider_name}/{self.model_name}",
             "mcp_tools_available": len(self.mcp_client.tools) if self.mcp_client else 0
@@ -517,8 +799,10 @@ Be helpful, accurate, and make full use of the available tools to provide the be
     
     async def cleanup(self):
         """Cleanup resources"""
+        self._cached_tool_schemas = []
+        self._cached_tool_names_joined = ""
         if self.mcp_client:
-            self.mcp_client.disconnect()
+            await self.mcp_client.disconnect()
         
         logger.info("Enhanced Universal Agent cleaned up")
 
@@ -0,0 +1,277 @@
+"""
+Response cache for AI providers with exact-match and semantic lookup
+"""
+
+import hashlib
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import orjson
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class InMemoryCacheBackend:
+    """Dict-backed cache storage with per-entry expiration"""
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a stored value, or None if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        """Store a value, optionally expiring after ttl seconds"""
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+
+    def clear(self):
+        """Remove all stored values"""
+        self._data.clear()
+
+
+class RedisCacheBackend:
+    """Cache storage backed by a redis-py client"""
+
+    def __init__(self, client, prefix: str = "llm-response:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a stored value, or None if missing or expired"""
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        """Store a value, letting Redis expire it after ttl seconds"""
+        self.client.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+
+    def clear(self):
+        """Remove all values stored under this backend's prefix"""
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+class _EmbeddingIndex:
+    """
+    Normalized embeddings in one contiguous float32 matrix.
+    
+    Rows live in a buffer that doubles when full, so inserts are amortized
+    O(1) instead of copying the whole matrix each time. Each key owns at most
+    one row, and expired rows are compacted away before the buffer grows.
+    """
+
+    def __init__(self, dim: int, capacity: int = 16):
+        self._buffer = np.empty((capacity, dim), dtype=np.float32)
+        # Monotonic expiry time per row (inf for rows that never expire)
+        self._expires = np.empty(capacity, dtype=np.float64)
+        self.keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, vector, key: str, expires_at: Optional[float] = None):
+        """Store a normalized vector for a cache key, replacing any earlier row for it"""
+        row = self._rows.get(key)
+        if row is None:
+            if len(self.keys) == len(self._buffer):
+                self.prune()
+            row = len(self.keys)
+            if row == len(self._buffer):
+                self._grow()
+            self.keys.append(key)
+            self._rows[key] = row
+        self._buffer[row] = vector
+        self._expires[row] = math.inf if expires_at is None else expires_at
+
+    def remove(self, key: str):
+        """Drop the row for a cache key, if any"""
+        row = self._rows.get(key)
+        if row is not None:
+            self._keep(np.delete(np.arange(len(self.keys)), row))
+
+    def prune(self):
+        """Drop rows whose entries have expired"""
+        live = self._expires[:len(self.keys)] > time.monotonic()
+        if not live.all():
+            self._keep(np.flatnonzero(live))
+
+    def matches(self, query, threshold: float) -> List[tuple]:
+        """Return (cosine score, key) of live rows scoring at least threshold, best first"""
+        self.prune()
+        # Rows are normalized, so one matrix-vector product gives all cosine scores
+        scores = self._buffer[:len(self.keys)] @ query
+        rows = np.flatnonzero(scores >= threshold)
+        rows = rows[np.argsort(-scores[rows], kind="stable")]
+        return [(float(scores[row]), self.keys[row]) for row in rows]
+
+    def _grow(self):
+        """Double the row capacity"""
+        size = len(self._buffer)
+        buffer = np.empty((size * 2, self._buffer.shape[1]), dtype=np.float32)
+        buffer[:size] = self._buffer
+        expires = np.empty(size * 2, dtype=np.float64)
+        expires[:size] = self._expires
+        self._buffer, self._expires = buffer, expires
+
+    def _keep(self, rows):
+        """Compact the index down to the given rows, preserving their order"""
+        count = len(rows)
+        self._buffer[:count] = self._buffer[rows]
+        self._expires[:count] = self._expires[rows]
+        self.keys = [self.keys[row] for row in rows]
+        self._rows = {key: row for row, key in enumerate(self.keys)}
+
+
+class ResponseCache:
+    """
+    Two-tier cache for AI responses.
+
+    Exact matches are looked up by a SHA-256 key over the full request.
+    When an embedder is configured, near-duplicate prompts are matched by
+    cosine similarity over an in-memory matrix of normalized embeddings.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        embedder: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: float = 0.92,
+        ttl: Optional[float] = 3600,
+        context_messages: int = 4
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            backend: Storage backend with get/set/clear (defaults to in-memory)
+            embedder: Function mapping text to an embedding vector; enables semantic lookup
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            ttl: Seconds before cached entries expire (None to keep forever)
+            context_messages: Trailing history messages a semantic hit must share
+        """
+        if embedder is not None and not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for semantic caching. Run: pip install numpy")
+
+        self.backend = backend or InMemoryCacheBackend()
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.context_messages = context_messages
+
+        # Semantic index per (namespace, context hash), so only entries from the
+        # same conversation context compete for the nearest neighbour
+        self._indexes: Dict[tuple, _EmbeddingIndex] = {}
+        self._next_prune = time.monotonic() + (ttl or 0)
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """Build a stable cache key from a JSON-serializable payload"""
+        serialized = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.sha256(serialized).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an exact match"""
+        value = self.backend.get(key)
+        if value is None:
+            return None
+        return orjson.loads(value)
+
+    def get_similar(
+        self,
+        text: str,
+        namespace: str = "",
+        context_hash: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up the closest cached entry for text within a namespace.
+
+        Only entries cached under the same conversation context are searched,
+        so "make it red" after two different prior turns never shares an answer.
+        """
+        partition = (namespace, context_hash)
+        index = self._indexes.get(partition)
+        if self.embedder is None or index is None:
+            return None
+
+        for _, key in index.matches(self._embed(text), self.similarity_threshold):
+            cached = self.get(key)
+            if cached is None:
+                # Evicted or expired in the backend, so the row is dead too
+                index.remove(key)
+            elif cached.get("context_hash", "") == context_hash:
+                return cached
+
+        if not index:
+            del self._indexes[partition]
+        return None
+
+    def set(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        text: Optional[str] = None,
+        namespace: str = "",
+        context_hash: str = ""
+    ):
+        """
+        Store a response.
+
+        Args:
+            key: Exact-match cache key
+            value: JSON-serializable response data
+            text: Text to index for semantic lookup
+            namespace: Semantic index partition (e.g. model and toolset)
+            context_hash: Hash of the conversation context the response depends on
+        """
+        self.backend.set(key, orjson.dumps({**value, "context_hash": context_hash}), self.ttl)
+
+        if self.embedder is None or text is None:
+            return
+
+        now = time.monotonic()
+        if self.ttl and now >= self._next_prune:
+            self._prune_indexes(now)
+
+        vector = self._embed(text)
+        partition = (namespace, context_hash)
+        index = self._indexes.get(partition)
+        if index is None:
+            index = self._indexes[partition] = _EmbeddingIndex(len(vector))
+        index.add(vector, key, now + self.ttl if self.ttl else None)
+
+    def clear(self):
+        """Remove all cached responses"""
+        self.backend.clear()
+        self._indexes.clear()
+
+    def _prune_indexes(self, now: float):
+        """Drop expired rows from every index, and indexes left empty"""
+        for partition, index in list(self._indexes.items()):
+            index.prune()
+            if not index:
+                del self._indexes[partition]
+        # Sweeping once per TTL bounds stale rows to about one TTL of sets
+        self._next_prune = now + self.ttl
+
+    def _embed(self, text: str):
+        """Embed text as a normalized float32 vector"""
+        vector = np.asarray(self.embedder(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        return vector
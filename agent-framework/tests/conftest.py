@@ -0,0 +1,45 @@
+"""
+Shared fixtures for the agent framework tests
+"""
+
+from typing import List, Optional
+
+import pytest
+
+from ai_interface import AIProvider, AIResponse, Message
+
+
+class FakeProvider(AIProvider):
+    """Provider that replays scripted responses instead of calling a model"""
+
+    def __init__(self, responses: Optional[List[AIResponse]] = None):
+        super().__init__("fake-model")
+        self.responses = list(responses or [])
+        # Messages of every chat() call, in order
+        self.requests: List[List[Message]] = []
+
+    def chat(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AIResponse:
+        self.requests.append(list(messages))
+        if self.responses:
+            return self.responses.pop(0)
+        return AIResponse(content=f"echo: {messages[-1].content}")
+
+    def supports_function_calling(self) -> bool:
+        return True
+
+    def supports_system_prompt(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def provider():
+    """A FakeProvider; append AIResponses to provider.responses to script it"""
+    fake = FakeProvider()
+    yield fake
+    fake.close()
@@ -0,0 +1,166 @@
+"""
+Tests for AIProvider.chat_simple(): response caching, the tool loop and speculation
+"""
+
+import pytest
+
+from ai_interface import AIResponse, MessageRole, ToolCall, create_tool_from_function
+from response_cache import NUMPY_AVAILABLE, ResponseCache
+
+requires_numpy = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy is not installed")
+
+NO_PARAMETERS = {"type": "object", "properties": {}}
+ADD_PARAMETERS = {
+    "type": "object",
+    "properties": {"a": {"type": "number"}, "b": {"type": "number"}},
+    "required": ["a", "b"]
+}
+
+
+def tool_response(*calls) -> AIResponse:
+    """A response calling each (name, arguments) pair"""
+    return AIResponse(
+        content=None,
+        tool_calls=[ToolCall(id=f"call-{i}", name=name, arguments=args) for i, (name, args) in enumerate(calls)]
+    )
+
+
+def tool_messages(messages):
+    return [(msg.name, msg.content) for msg in messages if msg.role == MessageRole.TOOL]
+
+
+class CallCounter:
+    """Tool function that counts its calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f"tick {self.calls}"
+
+
+def test_deterministic_requests_are_cached(provider):
+    provider.set_response_cache(ResponseCache())
+
+    assert provider.chat_simple("hi", temperature=0) == "echo: hi"
+    assert provider.chat_simple("hi", temperature=0) == "echo: hi"
+    assert len(provider.requests) == 1
+
+
+def test_cached_responses_are_keyed_by_generation_parameters(provider):
+    provider.set_response_cache(ResponseCache())
+
+    provider.chat_simple("hi", temperature=0, max_tokens=16)
+    provider.chat_simple("hi", temperature=0)
+    provider.chat_simple("hi", max_tokens=16, temperature=0)
+    assert len(provider.requests) == 2
+
+
+def test_sampled_requests_are_not_cached_unless_requested(provider):
+    provider.set_response_cache(ResponseCache())
+
+    provider.chat_simple("hi")
+    provider.chat_simple("hi")
+    assert len(provider.requests) == 2
+
+    provider.chat_simple("hi", use_cache=True)
+    provider.chat_simple("hi", use_cache=True)
+    assert len(provider.requests) == 3
+
+
+def test_cached_response_expires(provider, monkeypatch):
+    provider.set_response_cache(ResponseCache(ttl=60))
+    clock = [1000.0]
+    monkeypatch.setattr("response_cache.time.monotonic", lambda: clock[0])
+
+    provider.chat_simple("hi", temperature=0)
+    clock[0] += 61
+    provider.chat_simple("hi", temperature=0)
+    assert len(provider.requests) == 2
+
+
+@requires_numpy
+def test_semantic_hits_are_scoped_to_conversation_context(provider):
+    embedded = []
+
+    def embed(text):
+        embedded.append(text)
+        return [1.0, 0.0] if "red" in text else [0.0, 1.0]
+
+    provider.set_response_cache(ResponseCache(embedder=embed))
+    car = [provider.create_message(MessageRole.USER, "draw a car")]
+    house = [provider.create_message(MessageRole.USER, "draw a house")]
+
+    first = provider.chat_simple("make it red", car, temperature=0)
+    assert provider.chat_simple("make it red!", car, temperature=0) == first
+    assert provider.chat_simple("make it red!", house, temperature=0) == "echo: make it red!"
+    assert len(provider.requests) == 2
+
+    # Standalone queries only use exact matches, so they are never embedded
+    embedded.clear()
+    provider.chat_simple("make it red", temperature=0)
+    provider.chat_simple("make it red!", temperature=0)
+    assert embedded == []
+    assert len(provider.requests) == 4
+
+
+def test_tool_loop_runs_until_the_model_stops_calling_tools(provider):
+    provider.add_tool(create_tool_from_function(lambda a, b: a + b, "add", "Add", ADD_PARAMETERS))
+    provider.responses += [
+        tool_response(("add", {"a": 1, "b": 2})),
+        tool_response(("add", {"a": 3, "b": 4}), ("add", {"a": 5, "b": 6})),
+        AIResponse(content="done"),
+    ]
+
+    assert provider.chat_simple("add things") == "done"
+    assert len(provider.requests) == 3
+    assert tool_messages(provider.requests[-1]) == [("add", "3"), ("add", "7"), ("add", "11")]
+
+
+def test_tool_loop_stops_after_max_iterations(provider):
+    provider.add_tool(create_tool_from_function(lambda a, b: a + b, "add", "Add", ADD_PARAMETERS))
+    provider.responses += [tool_response(("add", {"a": 1, "b": 1}))] * 5
+
+    provider.chat_simple("loop forever", max_iterations=2)
+    assert len(provider.requests) == 3
+
+
+def test_speculative_result_is_committed_when_the_model_makes_the_call(provider):
+    tick = CallCounter()
+    provider.add_tool(create_tool_from_function(tick, "tick", "Count", NO_PARAMETERS))
+    provider.speculative_tools = True
+
+    # The first turn teaches the provider that turns start with tick
+    provider.responses += [tool_response(("tick", {})), AIResponse(content="one")]
+    provider.chat_simple("go")
+    assert tick.calls == 1
+
+    provider.responses += [tool_response(("tick", {})), AIResponse(content="two")]
+    assert provider.chat_simple("again") == "two"
+    assert tick.calls == 2
+    assert tool_messages(provider.requests[-1]) == [("tick", "tick 2")]
+
+
+def test_speculative_result_is_discarded_when_the_model_calls_something_else(provider):
+    tick = CallCounter()
+    provider.add_tool(create_tool_from_function(tick, "tick", "Count", NO_PARAMETERS))
+    provider.add_tool(create_tool_from_function(lambda a, b: a + b, "add", "Add", ADD_PARAMETERS))
+    provider.speculative_tools = True
+
+    provider.responses += [tool_response(("tick", {})), AIResponse(content="one")]
+    provider.chat_simple("go")
+
+    provider.responses += [tool_response(("add", {"a": 2, "b": 2})), AIResponse(content="four")]
+    assert provider.chat_simple("add") == "four"
+    assert tool_messages(provider.requests[-1]) == [("add", "4")]
+
+
+def test_speculation_is_off_by_default(provider):
+    tick = CallCounter()
+    provider.add_tool(create_tool_from_function(tick, "tick", "Count", NO_PARAMETERS))
+
+    provider.responses += [tool_response(("tick", {})), AIResponse(content="one")]
+    provider.chat_simple("go")
+    provider.chat_simple("no tools this time")
+    assert tick.calls == 1
@@ -0,0 +1,56 @@
+"""
+Tests for the MCP API server's log tail reader
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("dotenv")
+pytest.importorskip("toml")
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(scope="module")
+def tail_lines(tmp_path_factory):
+    """mcp_api_server._tail_lines, imported from a scratch directory"""
+    # The server reads config.toml from, and writes its log to, the working directory
+    workdir = tmp_path_factory.mktemp("server")
+    shutil.copy(REPO_ROOT / "config.toml", workdir)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(workdir)
+        from mcp_api_server import _tail_lines
+    return _tail_lines
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "server.log"
+    path.write_bytes(b"".join(b"line %d\n" % i for i in range(1000)))
+    return str(path)
+
+
+@pytest.mark.parametrize("block_size", [4096, 7, 1])
+def test_tail_returns_the_last_lines(tail_lines, log_file, block_size):
+    assert tail_lines(log_file, 3, block_size) == [b"line 997", b"line 998", b"line 999"]
+
+
+def test_tail_of_a_short_file_returns_every_line(tail_lines, log_file):
+    lines = tail_lines(log_file, 5000)
+    assert len(lines) == 1000
+    assert lines[0] == b"line 0"
+
+
+def test_tail_without_a_trailing_newline(tail_lines, tmp_path):
+    path = tmp_path / "partial.log"
+    path.write_bytes(b"first\nsecond\nthird")
+    assert tail_lines(str(path), 2, 4) == [b"second", b"third"]
+
+
+def test_tail_of_an_empty_file(tail_lines, tmp_path):
+    path = tmp_path / "empty.log"
+    path.write_bytes(b"")
+    assert tail_lines(str(path), 10) == []
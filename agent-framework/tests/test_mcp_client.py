@@ -0,0 +1,123 @@
+"""
+Tests for the MCP client's request dispatch, run against a scripted stdio server
+"""
+
+import asyncio
+import sys
+import textwrap
+
+import pytest
+
+from mcp_client import MCPClient
+
+# Answers tools/call requests from worker threads, so a call that sleeps is
+# answered after calls sent later; "size" pads the reply to that many bytes
+_SERVER = textwrap.dedent('''
+    import json, sys, threading, time
+
+    lock = threading.Lock()
+
+    def reply(request_id, result):
+        with lock:
+            sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result}) + "\\n")
+            sys.stdout.flush()
+
+    def call(request):
+        arguments = request["params"]["arguments"]
+        time.sleep(arguments.get("sleep", 0))
+        text = arguments["tag"] + "x" * arguments.get("size", 0)
+        reply(request["id"], {"content": [{"type": "text", "text": text}]})
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        if "id" not in request:
+            continue
+        if request["method"] == "initialize":
+            reply(request["id"], {"protocolVersion": "2024-11-05"})
+        elif request["method"] == "tools/list":
+            tool = {"name": "echo", "description": "Echo a tag", "inputSchema": {"type": "object"}}
+            reply(request["id"], {"tools": [tool]})
+        else:
+            threading.Thread(target=call, args=(request,)).start()
+''')
+
+
+@pytest.fixture
+def server_command(tmp_path):
+    path = tmp_path / "server.py"
+    path.write_text(_SERVER)
+    return [sys.executable, str(path)]
+
+
+def run_client(server_command, scenario):
+    """Connect a client to the scripted server, run scenario(client), then disconnect"""
+    async def main():
+        client = MCPClient(server_command)
+        assert await client.connect()
+        try:
+            return await asyncio.wait_for(scenario(client), timeout=30)
+        finally:
+            await client.disconnect()
+
+    return asyncio.run(main())
+
+
+def text_of(result):
+    return result["content"][0]["text"]
+
+
+def test_connect_lists_tools(server_command):
+    async def scenario(client):
+        return list(client.tools)
+
+    assert run_client(server_command, scenario) == ["echo"]
+
+
+def test_concurrent_calls_get_their_own_responses(server_command):
+    async def scenario(client):
+        # Earlier calls sleep longer, so responses arrive in reverse order
+        return await asyncio.gather(*(
+            client.call_tool("echo", {"tag": f"call-{i}", "sleep": 0.05 * (4 - i)})
+            for i in range(5)
+        ))
+
+    results = run_client(server_command, scenario)
+    assert [text_of(result) for result in results] == [f"call-{i}" for i in range(5)]
+
+
+def test_response_larger_than_the_stream_buffer(server_command):
+    size = 3 * 2**20
+
+    async def scenario(client):
+        large, small = await asyncio.gather(
+            client.call_tool("echo", {"tag": "large", "size": size}),
+            client.call_tool("echo", {"tag": "small", "sleep": 0.1}),
+        )
+        return large, small
+
+    large, small = run_client(server_command, scenario)
+    assert text_of(large) == "large" + "x" * size
+    assert text_of(small) == "small"
+
+
+def test_unknown_tool_is_rejected_without_a_request(server_command):
+    async def scenario(client):
+        with pytest.raises(Exception, match="not found"):
+            await client.call_tool("missing", {})
+        return client._pending
+
+    assert run_client(server_command, scenario) == {}
+
+
+def test_disconnect_fails_calls_in_flight(server_command):
+    async def main():
+        client = MCPClient(server_command)
+        assert await client.connect()
+        call = asyncio.create_task(client.call_tool("echo", {"tag": "slow", "sleep": 10}))
+        await asyncio.sleep(0.1)
+        await client.disconnect()
+        with pytest.raises(ConnectionError, match="disconnected"):
+            await asyncio.wait_for(call, timeout=5)
+        return client._pending
+
+    assert asyncio.run(main()) == {}
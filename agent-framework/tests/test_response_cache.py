@@ -0,0 +1,112 @@
+"""
+Tests for the exact-match and semantic response cache
+"""
+
+import time
+
+import pytest
+
+from response_cache import NUMPY_AVAILABLE, ResponseCache
+
+requires_numpy = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy is not installed")
+
+# Toy embeddings: "red" prompts point one way, "blue" prompts another
+_VECTORS = {
+    "make it red": [1.0, 0.0, 0.0],
+    "make it red please": [0.99, 0.1, 0.0],
+    "make it blue": [0.0, 1.0, 0.0],
+}
+
+
+def embed(text):
+    return _VECTORS[text]
+
+
+def test_exact_hit_and_miss():
+    cache = ResponseCache()
+    key = ResponseCache.make_key({"messages": ["hi"]})
+
+    assert cache.get(key) is None
+    cache.set(key, {"content": "hello"})
+    assert cache.get(key) == {"content": "hello", "context_hash": ""}
+    assert cache.get(ResponseCache.make_key({"messages": ["bye"]})) is None
+
+
+def test_make_key_ignores_dict_order():
+    assert ResponseCache.make_key({"a": 1, "b": 2}) == ResponseCache.make_key({"b": 2, "a": 1})
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(ttl=0.05)
+    cache.set("key", {"content": "hello"})
+    assert cache.get("key") is not None
+
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+
+def test_clear_removes_entries():
+    cache = ResponseCache()
+    cache.set("key", {"content": "hello"})
+    cache.clear()
+    assert cache.get("key") is None
+
+
+def test_embedder_requires_numpy(monkeypatch):
+    monkeypatch.setattr("response_cache.NUMPY_AVAILABLE", False)
+    with pytest.raises(ImportError):
+        ResponseCache(embedder=embed)
+
+
+@requires_numpy
+def test_similar_prompt_hits_above_threshold():
+    cache = ResponseCache(embedder=embed)
+    cache.set("red", {"content": "red car"}, text="make it red", namespace="model")
+
+    assert cache.get_similar("make it red please", "model")["content"] == "red car"
+    assert cache.get_similar("make it blue", "model") is None
+    assert cache.get_similar("make it red please", "other-model") is None
+
+
+@requires_numpy
+def test_similar_lookup_is_scoped_to_context():
+    cache = ResponseCache(embedder=embed)
+    cache.set("car", {"content": "red car"}, text="make it red", context_hash="car")
+    cache.set("house", {"content": "red house"}, text="make it red", context_hash="house")
+
+    assert cache.get_similar("make it red please", context_hash="car")["content"] == "red car"
+    assert cache.get_similar("make it red please", context_hash="house")["content"] == "red house"
+    assert cache.get_similar("make it red please", context_hash="boat") is None
+
+
+@requires_numpy
+def test_overwriting_a_key_keeps_one_row():
+    cache = ResponseCache(embedder=embed)
+    for i in range(5):
+        cache.set("red", {"content": str(i)}, text="make it red")
+
+    index = cache._indexes[("", "")]
+    assert index.keys == ["red"]
+    assert cache.get_similar("make it red please")["content"] == "4"
+
+
+@requires_numpy
+def test_expired_rows_are_pruned():
+    cache = ResponseCache(embedder=embed, ttl=0.05)
+    cache.set("red", {"content": "red car"}, text="make it red")
+
+    time.sleep(0.1)
+    assert cache.get_similar("make it red please") is None
+    assert not cache._indexes
+
+
+@requires_numpy
+def test_evicted_best_row_falls_through_to_next_match():
+    cache = ResponseCache(embedder=embed)
+    cache.set("exact", {"content": "first"}, text="make it red please")
+    cache.set("close", {"content": "second"}, text="make it red")
+
+    # Drop the closest entry from storage behind the index's back
+    cache.backend._data.pop("exact")
+    assert cache.get_similar("make it red please")["content"] == "second"
+    assert cache._indexes[("", "")].keys == ["close"]
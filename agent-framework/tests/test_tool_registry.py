@@ -0,0 +1,53 @@
+"""
+Tests for executing tools through the tool registry
+"""
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from tool_registry import ToolResult, execute_tool, execute_tools
+
+
+def test_tool_result_to_dict():
+    assert ToolResult(True, "calculator", result=5).to_dict() == {
+        "success": True,
+        "result": 5,
+        "tool": "calculator"
+    }
+    assert ToolResult(False, "calculator", error="boom").to_dict() == {
+        "success": False,
+        "error": "boom",
+        "tool": "calculator"
+    }
+
+
+def test_execute_tool_wraps_results_and_errors():
+    assert execute_tool("calculator", operation="add", x=1, y=2) == ToolResult(True, "calculator", result=3)
+
+    result = execute_tool("calculator", operation="sqrt", x=-1)
+    assert not result.success
+    assert "negative" in result.error
+
+
+def test_execute_tool_rejects_unknown_tools():
+    with pytest.raises(ValueError):
+        execute_tool("no_such_tool")
+
+
+def test_execute_tools_returns_results_in_call_order():
+    results = execute_tools([
+        ("calculator", {"operation": "multiply", "x": 2, "y": 3}),
+        ("word_count", {"text": "one two"}),
+        ("calculator", {"operation": "sqrt", "x": -1}),
+    ])
+
+    assert [result.tool for result in results] == ["calculator", "word_count", "calculator"]
+    assert results[0].result == 6
+    assert results[1].result["words"] == 2
+    assert not results[2].success
+
+
+def test_execute_tools_checks_every_name_before_running_any():
+    with pytest.raises(ValueError):
+        execute_tools([("calculator", {"operation": "add", "x": 1, "y": 1}), ("no_such_tool", {})])
@@ -0,0 +1,86 @@
+"""
+Tests for the basic utility tools
+"""
+
+import math
+import re
+
+import pytest
+
+import tools
+from tools import calculator, convert_temperature, get_current_time, word_count
+
+
+@pytest.mark.parametrize("operation, x, y, expected", [
+    ("add", 2, 3, 5),
+    ("subtract", 2, 3, -1),
+    ("multiply", 2, 3, 6),
+    ("divide", 3, 2, 1.5),
+    ("power", 2, 3, 8),
+])
+def test_calculator_operations(operation, x, y, expected):
+    assert calculator(operation, x, y) == expected
+
+
+def test_calculator_sqrt_takes_one_number():
+    assert calculator("sqrt", 9) == 3.0
+    with pytest.raises(ValueError):
+        calculator("sqrt", -1)
+
+
+def test_calculator_divide_by_zero_is_infinite():
+    assert calculator("divide", 1, 0) == math.inf
+
+
+def test_calculator_rejects_bad_input():
+    with pytest.raises(ValueError, match="Unknown operation"):
+        calculator("modulo", 1, 2)
+    with pytest.raises(ValueError, match="requires two numbers"):
+        calculator("add", 1)
+
+
+def test_get_current_time_format():
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} UTC", get_current_time())
+
+
+def test_get_current_time_is_reformatted_once_per_second(monkeypatch):
+    now = [86400.25]
+    monkeypatch.setattr(tools.time, "time", lambda: now[0])
+    monkeypatch.setattr(tools, "_last_time", (0, ""))
+
+    first = get_current_time()
+    assert first == "1970-01-02 00:00:00 UTC"
+    now[0] = 86400.75
+    assert get_current_time() is first
+    now[0] = 86401.0
+    assert get_current_time() == "1970-01-02 00:00:01 UTC"
+
+
+def test_word_count():
+    assert word_count("hello  world\nsecond line") == {
+        "words": 4,
+        "characters": 24,
+        "characters_no_spaces": 21,
+        "lines": 2
+    }
+    assert word_count("") == {"words": 0, "characters": 0, "characters_no_spaces": 0, "lines": 1}
+
+
+@pytest.mark.parametrize("temperature, from_unit, to_unit, expected", [
+    (100, "C", "F", 212.0),
+    (212, "F", "C", 100.0),
+    (0, "C", "K", 273.15),
+    (273.15, "K", "C", 0.0),
+    (32, "F", "K", 273.15),
+    (0, "K", "F", -459.67),
+    (37, "c", "c", 37),
+])
+def test_convert_temperature(temperature, from_unit, to_unit, expected):
+    assert convert_temperature(temperature, from_unit, to_unit) == pytest.approx(expected)
+
+
+def test_convert_temperature_rejects_unknown_units():
+    with pytest.raises(ValueError, match="Unknown temperature unit: X"):
+        convert_temperature(1, "x", "C")
+    with pytest.raises(ValueError, match="Unknown temperature unit: R"):
+        convert_temperature(1, "C", "r")
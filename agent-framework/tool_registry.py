@@ -2,6 +2,11 @@
 Tool Registry - Centralized management of all available tools with human-readable descriptions
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
 from tools import (
     calculator, get_current_time, generate_random_number, 
     word_count, convert_temperature, TOOL_SCHEMAS
@@ -131,47 +136,104 @@ TOOL_DESCRIPTIONS = {
     }
 }
 
+def _describe_tool(tool_name: str) -> dict:
+    """Build the API description of one tool"""
+    tool_info = TOOL_DESCRIPTIONS.get(tool_name, {})
+    return {
+        'id': tool_name,
+        'name': tool_info.get('name', tool_name.replace('_', ' ').title()),
+        'description': tool_info.get('description', 'No description available'),
+        'category': tool_info.get('category', 'Uncategorized'),
+        'icon': tool_info.get('icon', '🔧'),
+        'schema': ALL_TOOL_SCHEMAS.get(tool_name, {})
+    }
+
+# The tables above never change, so the tool listings are built once at import
+_ALL_TOOLS = tuple(_describe_tool(tool_name) for tool_name in TOOL_FUNCTIONS)
+_TOOLS_BY_CATEGORY = {}
+for _tool in _ALL_TOOLS:
+    _TOOLS_BY_CATEGORY.setdefault(_tool['category'], []).append(_tool)
+_TOOLS_BY_CATEGORY = {category: tuple(tools) for category, tools in _TOOLS_BY_CATEGORY.items()}
+del _tool
+
+# Browser tools share one page, so execute_tools() runs them one at a time, in order
+_SERIAL_TOOLS = frozenset(
+    tool_name for tool_name, tool_info in TOOL_DESCRIPTIONS.items()
+    if tool_info['category'] == 'Web Automation'
+)
+
+# Shared by execute_tools() calls; threads are only started as needed
+_tool_executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+
 def get_all_tools():
-    """Get all available tools with their descriptions and schemas"""
-    tools = []
-    for tool_name in TOOL_FUNCTIONS.keys():
-        tool_info = TOOL_DESCRIPTIONS.get(tool_name, {})
-        tools.append({
-            'id': tool_name,
-            'name': tool_info.get('name', tool_name.replace('_', ' ').title()),
-            'description': tool_info.get('description', 'No description available'),
-            'category': tool_info.get('category', 'Uncategorized'),
-            'icon': tool_info.get('icon', '🔧'),
-            'schema': ALL_TOOL_SCHEMAS.get(tool_name, {})
-        })
-    return tools
+    """
+    Get all available tools with their descriptions and schemas.
+    
+    The tool dicts are shared between calls and must not be modified.
+    """
+    return _ALL_TOOLS
 
 def get_tools_by_category():
-    """Get tools organized by category"""
-    categories = {}
-    for tool in get_all_tools():
-        category = tool['category']
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(tool)
-    return categories
+    """
+    Get tools organized by category.
+    
+    The dict is a fresh copy, but the tool dicts in it are shared between
+    calls and must not be modified.
+    """
+    return dict(_TOOLS_BY_CATEGORY)
 
-def execute_tool(tool_name: str, **kwargs):
+@dataclass(slots=True, frozen=True)
+class ToolResult:
+    """Outcome of executing a tool: its result on success, the error message otherwise"""
+    success: bool
+    tool: str
+    result: Any = None
+    error: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        """Convert to the API's JSON envelope"""
+        if self.success:
+            return {'success': True, 'result': self.result, 'tool': self.tool}
+        return {'success': False, 'error': self.error, 'tool': self.tool}
+
+def execute_tool(tool_name: str, **kwargs) -> ToolResult:
     """Execute a tool by name with provided arguments"""
     if tool_name not in TOOL_FUNCTIONS:
         raise ValueError(f"Unknown tool: {tool_name}")
     
     tool_function = TOOL_FUNCTIONS[tool_name]
     try:
-        result = tool_function(**kwargs)
-        return {
-            'success': True,
-            'result': result,
-            'tool': tool_name
-        }
+        return ToolResult(True, tool_name, result=tool_function(**kwargs))
     except Exception as e:
-        return {
-            'success': False,
-            'error': str(e),
-            'tool': tool_name
-        }
\ No newline at end of file
+        return ToolResult(False, tool_name, error=str(e))
+
+def execute_tools(calls: List[Tuple[str, Dict[str, Any]]]) -> List[ToolResult]:
+    """
+    Execute several tools, running independent ones concurrently.
+    
+    Args:
+        calls: (tool name, arguments) pairs
+        
+    Returns:
+        Results in the same order as calls
+    """
+    for tool_name, _ in calls:
+        if tool_name not in TOOL_FUNCTIONS:
+            raise ValueError(f"Unknown tool: {tool_name}")
+    
+    parallel = [i for i, (tool_name, _) in enumerate(calls) if tool_name not in _SERIAL_TOOLS]
+    if len(parallel) < 2:
+        return [execute_tool(tool_name, **arguments) for tool_name, arguments in calls]
+    
+    futures = {i: _tool_executor.submit(execute_tool, calls[i][0], **calls[i][1]) for i in parallel}
+    
+    # Browser tools run in this thread, in order, while the pool works
+    results: List[Optional[ToolResult]] = [None] * len(calls)
+    for i, (tool_name, arguments) in enumerate(calls):
+        if i not in futures:
+            results[i] = execute_tool(tool_name, **arguments)
+    
+    for i, future in futures.items():
+        results[i] = future.result()
+    
+    return results
\ No newline at end of file
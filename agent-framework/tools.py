@@ -3,11 +3,33 @@ Collection of tools/functions that can be used by the OpenAI agent.
 """
 
 import math
+import operator
 import random
-from datetime import datetime
+import time
 from typing import Union
 
 
+# Two-operand calculator operations; sqrt and division by zero are handled separately
+_OPERATIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+    "power": operator.pow,
+}
+
+# (second, formatted time) from the last get_current_time() call, replaced as a
+# whole so concurrent callers never see a mismatched pair
+_last_time = (0, "")
+
+# Per unit (offset, numerator, denominator): celsius = (t - offset) * numerator / denominator
+_TEMPERATURE_UNITS = {
+    "C": (0, 1, 1),
+    "F": (32, 5, 9),
+    "K": (273.15, 1, 1),
+}
+
+
 def calculator(operation: str, x: float, y: float = None) -> float:
     """
     Perform basic mathematical operations.
@@ -20,27 +42,22 @@ def calculator(operation: str, x: float, y: float = None) -> float:
     Returns:
         The result of the mathematical operation
     """
-    operations = {
-        "add": lambda a, b: a + b,
-        "subtract": lambda a, b: a - b,
-        "multiply": lambda a, b: a * b,
-        "divide": lambda a, b: a / b if b != 0 else float('inf'),
-        "power": lambda a, b: a ** b,
-        "sqrt": lambda a, b: math.sqrt(a)  # b is ignored for sqrt
-    }
-    
-    if operation not in operations:
-        raise ValueError(f"Unknown operation: {operation}")
-    
     if operation == "sqrt":
         if x < 0:
             raise ValueError("Cannot take square root of negative number")
         return math.sqrt(x)
     
+    op = _OPERATIONS.get(operation)
+    if op is None:
+        raise ValueError(f"Unknown operation: {operation}")
+    
     if y is None:
         raise ValueError(f"Operation '{operation}' requires two numbers")
     
-    return operations[operation](x, y)
+    if op is operator.truediv and y == 0:
+        return float('inf')
+    
+    return op(x, y)
 
 
 def get_current_time(timezone: str = "UTC") -> str:
@@ -53,8 +70,13 @@ def get_current_time(timezone: str = "UTC") -> str:
     Returns:
         Current time as a formatted string
     """
-    now = datetime.now()
-    return now.strftime("%Y-%m-%d %H:%M:%S UTC")
+    global _last_time
+    
+    # The string only changes once a second, so format it at most that often
+    second = int(time.time())
+    if second != _last_time[0]:
+        _last_time = (second, time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(second)))
+    return _last_time[1]
 
 
 def generate_random_number(min_val: int = 1, max_val: int = 100) -> int:
@@ -81,10 +103,11 @@ def word_count(text: str) -> dict:
     Returns:
         Dictionary with word count, character count, and line count
     """
+    # Count in place rather than building a copy without spaces or a list of lines
     words = len(text.split())
     characters = len(text)
-    characters_no_spaces = len(text.replace(" ", ""))
-    lines = len(text.split("\n"))
+    characters_no_spaces = characters - text.count(" ")
+    lines = text.count("\n") + 1
     
     return {
         "words": words,
@@ -106,28 +129,18 @@ def convert_temperature(temperature: float, from_unit: str, to_unit: str) -> flo
     Returns:
         Converted temperature
     """
-    from_unit = from_unit.upper()
-    to_unit = to_unit.upper()
-    
-    # Convert to Celsius first
-    if from_unit == "F":
-        celsius = (temperature - 32) * 5/9
-    elif from_unit == "K":
-        celsius = temperature - 273.15
-    elif from_unit == "C":
-        celsius = temperature
-    else:
-        raise ValueError(f"Unknown temperature unit: {from_unit}")
-    
-    # Convert from Celsius to target
-    if to_unit == "C":
-        return celsius
-    elif to_unit == "F":
-        return celsius * 9/5 + 32
-    elif to_unit == "K":
-        return celsius + 273.15
-    else:
-        raise ValueError(f"Unknown temperature unit: {to_unit}")
+    try:
+        from_offset, from_numerator, from_denominator = _TEMPERATURE_UNITS[from_unit.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown temperature unit: {from_unit.upper()}") from None
+    try:
+        to_offset, to_numerator, to_denominator = _TEMPERATURE_UNITS[to_unit.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown temperature unit: {to_unit.upper()}") from None
+    
+    # Convert to Celsius first, then from Celsius to the target
+    celsius = (temperature - from_offset) * from_numerator / from_denominator
+    return celsius * to_denominator / to_numerator + to_offset
 
 
 # Function schemas for OpenAI function calling
@@ -3,7 +3,8 @@ Universal AI Agent that can work with any AI provider
 (OpenAI, Gemini, Claude, etc.) through the unified interface
 """
 
-from typing import List, Optional, Dict, Any, Union
+from collections import deque
+from typing import Deque, List, Optional, Dict, Any, Union
 from ai_interface import (
     AIProvider, Message, MessageRole, ToolDefinition, 
     create_tool_from_function, ProviderFactory
@@ -24,6 +25,7 @@ class UniversalAgent:
         model_name: str = None,
         system_prompt: str = "You are a helpful AI assistant.",
         api_key: Optional[str] = None,
+        max_history_messages: Optional[int] = 20,
         **provider_kwargs
     ):
         """
@@ -34,6 +36,8 @@ class UniversalAgent:
             model_name: Name of the model to use (e.g., "gpt-4", "gemini-pro")
             system_prompt: System prompt for the agent
             api_key: API key for the provider
+            max_history_messages: Messages kept in the conversation history; the
+                oldest whole turns are dropped as new ones arrive (None keeps all)
             **provider_kwargs: Additional provider-specific arguments
         """
         if isinstance(provider, str):
@@ -48,8 +52,11 @@ class UniversalAgent:
             self.provider = provider
         
         # Set system prompt
-        self.provider.set_system_prompt(system_prompt)
-        self.conversation_history: List[Message] = []
+        if system_prompt:
+            self.provider.set_system_prompt(system_prompt)
+        # A deque, so old turns fall off the front without copying the history
+        self.conversation_history: Deque[Message] = deque()
+        self.max_history_messages = max_history_messages
         
     @property
     def model_name(self) -> str:
@@ -92,11 +99,28 @@ class UniversalAgent:
     
     def clear_conversation(self):
         """Clear the conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
     
     def get_conversation_history(self) -> List[Message]:
         """Get the current conversation history"""
-        return self.conversation_history.copy()
+        return list(self.conversation_history)
+    
+    def _trim_history(self):
+        """Drop the oldest whole turns once the history exceeds max_history_messages"""
+        if self.max_history_messages is None:
+            return
+        
+        history = self.conversation_history
+        excess = len(history) - self.max_history_messages
+        if excess <= 0:
+            return
+        
+        # Cut at a user message so a reply is never left without its question
+        for cut in range(excess, len(history)):
+            if history[cut].role == MessageRole.USER:
+                for _ in range(cut):
+                    history.popleft()
+                return
     
     def chat(
         self, 
@@ -129,7 +153,7 @@ class UniversalAgent:
             **kwargs
         )
         
-        # Update conversation history
+        # Update conversation history, dropping the oldest turns
         if use_history:
             self.conversation_history.append(
                 self.provider.create_message(MessageRole.USER, message)
@@ -137,10 +161,54 @@ class UniversalAgent:
             self.conversation_history.append(
                 self.provider.create_message(MessageRole.ASSISTANT, response)
             )
-            
-            # Keep history manageable (last 20 messages)
-            if len(self.conversation_history) > 20:
-                self.conversation_history = self.conversation_history[-20:]
+            self._trim_history()
+        
+        return response
+    
+    async def achat(
+        self, 
+        message: str, 
+        use_history: bool = True,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Async version of chat().
+        
+        Waits on the provider without blocking the event loop, so many
+        conversations can run in one process. Tool calls from a single
+        response are executed concurrently.
+        
+        Args:
+            message: The user message
+            use_history: Whether to include conversation history
+            temperature: Controls randomness in responses
+            max_tokens: Maximum tokens in response
+            **kwargs: Additional provider-specific parameters
+        
+        Returns:
+            The agent's response as a string
+        """
+        history = self.conversation_history if use_history else []
+        
+        response = await self.provider.achat_simple(
+            message, 
+            conversation_history=history,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        
+        # Update conversation history, dropping the oldest turns
+        if use_history:
+            self.conversation_history.append(
+                self.provider.create_message(MessageRole.USER, message)
+            )
+            self.conversation_history.append(
+                self.provider.create_message(MessageRole.ASSISTANT, response)
+            )
+            self._trim_history()
         
         return response
     
@@ -212,6 +280,8 @@ class UniversalAgent:
         if isinstance(provider, str):
             if model_name is None:
                 raise ValueError("model_name is required when switching to provider by name")
+            # A new instance, since providers hold per-agent tools and prompt;
+            # the HTTP connection pool is shared between providers anyway
             self.provider = ProviderFactory.create_provider(
                 provider, model_name, api_key, **provider_kwargs
             )
@@ -3,13 +3,15 @@ OpenAI implementation of the AI interface
 """
 
 import os
-from typing import List, Optional, Dict, Any
-from openai import OpenAI
+import sys
+import json
+from typing import Iterator, List, Optional, Dict, Any
+import orjson
+from openai import AsyncOpenAI, OpenAI
 from dotenv import load_dotenv
 
 from ai_interface import (
-    AIProvider, AIResponse, Message, MessageRole, ToolCall, ToolDefinition,
-    messages_to_dict
+    AIProvider, AIResponse, Message, MessageRole, ToolCall, ToolDefinition
 )
 
 load_dotenv()
@@ -20,7 +22,12 @@ class OpenAIProvider(AIProvider):
     
     def __init__(self, model_name: str = "gpt-4", api_key: Optional[str] = None):
         super().__init__(model_name, api_key)
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        self.client = OpenAI(
+            api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            http_client=self.http_client
+        )
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_client_http = None
         
         # OpenAI models that support function calling
         self.function_calling_models = {
@@ -51,6 +58,10 @@ class OpenAIProvider(AIProvider):
             })
         return tools
     
+    def _serialize_tools(self) -> List[Dict[str, Any]]:
+        """Tools payload for chat completions, cached between calls"""
+        return self._convert_tools_to_openai_format()
+    
     def _convert_openai_response(self, response) -> AIResponse:
         """Convert OpenAI response to our standard format"""
         message = response.choices[0].message
@@ -59,7 +70,6 @@ class OpenAIProvider(AIProvider):
         tool_calls = []
         if hasattr(message, 'tool_calls') and message.tool_calls:
             for tool_call in message.tool_calls:
-                import json
                 try:
                     arguments = json.loads(tool_call.function.arguments)
                 except json.JSONDecodeError:
@@ -67,7 +77,7 @@ class OpenAIProvider(AIProvider):
                 
                 tool_calls.append(ToolCall(
                     id=tool_call.id,
-                    name=tool_call.function.name,
+                    name=sys.intern(tool_call.function.name),
                     arguments=arguments
                 ))
         
@@ -87,45 +97,44 @@ class OpenAIProvider(AIProvider):
             usage=usage
         )
     
-    def chat(
-        self, 
-        messages: List[Message], 
-        temperature: float = 0.7,
-        max_tokens: Optional[int] = None,
-        **kwargs
-    ) -> AIResponse:
-        """Send messages to OpenAI and get a response"""
+    def _format_message(self, msg: Message) -> Dict[str, Any]:
+        """Convert one message straight to OpenAI's chat format"""
+        openai_msg = {
+            "role": msg.role.value,
+            "content": msg.content
+        }
         
-        # Convert our message format to OpenAI format
-        openai_messages = []
-        for msg in messages:
-            openai_msg = {
-                "role": msg.role.value,
-                "content": msg.content
-            }
-            
-            # Add additional fields for tool messages
-            if msg.tool_call_id:
-                openai_msg["tool_call_id"] = msg.tool_call_id
-            if msg.name:
-                openai_msg["name"] = msg.name
-            
-            # Add tool_calls for assistant messages
-            if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                openai_tool_calls = []
-                for tool_call in msg.tool_calls:
-                    import json
-                    openai_tool_calls.append({
-                        "id": tool_call.id,
-                        "type": "function",
-                        "function": {
-                            "name": tool_call.name,
-                            "arguments": json.dumps(tool_call.arguments)
-                        }
-                    })
-                openai_msg["tool_calls"] = openai_tool_calls
-                
-            openai_messages.append(openai_msg)
+        # Add additional fields for tool messages
+        if msg.tool_call_id:
+            openai_msg["tool_call_id"] = msg.tool_call_id
+        if msg.name:
+            openai_msg["name"] = msg.name
+        
+        # Add tool_calls for assistant messages
+        if msg.tool_calls:
+            openai_msg["tool_calls"] = [
+                {
+                    "id": tool_call.id,
+                    "type": "function",
+                    "function": {
+                        "name": tool_call.name,
+                        "arguments": orjson.dumps(tool_call.arguments).decode()
+                    }
+                }
+                for tool_call in msg.tool_calls
+            ]
+        
+        return openai_msg
+    
+    def _build_api_params(
+        self,
+        messages: List[Message],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build chat completion parameters from our message format"""
+        openai_messages = self._format_messages(messages)
         
         # Prepare API call parameters
         api_params = {
@@ -139,17 +148,108 @@ class OpenAIProvider(AIProvider):
         
         # Add tools if available and model supports function calling
         if self.tools and self.supports_function_calling():
-            api_params["tools"] = self._convert_tools_to_openai_format()
+            api_params["tools"] = self._get_tools_payload()
             api_params["tool_choice"] = "auto"
         
         # Add any additional OpenAI-specific parameters
         api_params.update(kwargs)
         
+        return api_params
+    
+    def chat(
+        self, 
+        messages: List[Message], 
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AIResponse:
+        """Send messages to OpenAI and get a response"""
+        api_params = self._build_api_params(messages, temperature, max_tokens, **kwargs)
+        
         # Make the API call
         response = self.client.chat.completions.create(**api_params)
         
         return self._convert_openai_response(response)
     
+    async def achat(
+        self, 
+        messages: List[Message], 
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AIResponse:
+        """Send messages to OpenAI without blocking the event loop"""
+        api_params = self._build_api_params(messages, temperature, max_tokens, **kwargs)
+        
+        response = await self.async_client.chat.completions.create(**api_params)
+        
+        return self._convert_openai_response(response)
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Async OpenAI client on the shared pool of the running event loop"""
+        http_client = self.async_http_client
+        if self._async_client is None or self._async_client_http is not http_client:
+            self._async_client = AsyncOpenAI(api_key=self.client.api_key, http_client=http_client)
+            self._async_client_http = http_client
+        return self._async_client
+    
+    async def startup(self):
+        """Create the async OpenAI client and its connection pool ahead of the first request"""
+        self.async_client
+    
+    def chat_stream(
+        self, 
+        messages: List[Message], 
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[AIResponse]:
+        """Send messages to OpenAI and stream the response as it is generated"""
+        api_params = self._build_api_params(messages, temperature, max_tokens, **kwargs)
+        api_params["stream"] = True
+        
+        # Tool call fragments arrive spread over many chunks, keyed by index
+        tool_call_parts: Dict[int, Dict[str, str]] = {}
+        finish_reason = None
+        
+        for chunk in self.client.chat.completions.create(**api_params):
+            if not chunk.choices:
+                continue
+            
+            choice = chunk.choices[0]
+            delta = choice.delta
+            
+            if delta.content:
+                yield AIResponse(content=delta.content)
+            
+            if delta.tool_calls:
+                for tool_call in delta.tool_calls:
+                    part = tool_call_parts.setdefault(
+                        tool_call.index, {"id": "", "name": "", "arguments": ""}
+                    )
+                    if tool_call.id:
+                        part["id"] = tool_call.id
+                    if tool_call.function:
+                        if tool_call.function.name:
+                            part["name"] += tool_call.function.name
+                        if tool_call.function.arguments:
+                            part["arguments"] += tool_call.function.arguments
+            
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        
+        tool_calls = []
+        for index in sorted(tool_call_parts):
+            part = tool_call_parts[index]
+            try:
+                arguments = json.loads(part["arguments"]) if part["arguments"] else {}
+            except json.JSONDecodeError:
+                arguments = {}
+            tool_calls.append(ToolCall(id=part["id"], name=sys.intern(part["name"]), arguments=arguments))
+        
+        yield AIResponse(content=None, tool_calls=tool_calls, finish_reason=finish_reason)
+    
     def get_available_models(self) -> List[str]:
         """Get list of available OpenAI models"""
         try:
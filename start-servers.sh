@@ -15,20 +15,21 @@ fi
 source venv/bin/activate
 
 # Check if dependencies are installed
-if ! python -c "import flask" 2>/dev/null; then
-    echo "❌ Flask not found. Installing dependencies..."
+if ! python -c "import fastapi, uvicorn" 2>/dev/null; then
+    echo "❌ FastAPI/Uvicorn not found. Installing dependencies..."
     pip install -r agent-framework/requirements.txt
 fi
 
 # Kill any existing servers
 echo "🧹 Cleaning up existing servers..."
-pkill -f mcp_api_server.py 2>/dev/null || true
+pkill -f mcp_api_server 2>/dev/null || true
 pkill -f vite 2>/dev/null || true
 
 # Start MCP API Server in background
 echo "🔧 Starting MCP API Server on port 4090..."
 cd agent-framework
-PYTHONPATH=.. python mcp_api_server.py &
+# Single worker: the agent keeps conversation state in-process
+PYTHONPATH=.. uvicorn mcp_api_server:app --host localhost --port 4090 --loop uvloop --http httptools &
 MCP_PID=$!
 cd ..
 